@@ -0,0 +1,77 @@
+# benchmarks/dispatch_concurrency.py - Parallel dispatcher throughput
+#
+# Run from the project root:
+#     python -m benchmarks.dispatch_concurrency
+
+import random
+import threading
+import time
+
+from config import RESOURCE_TYPES
+from core import ResourceManager
+from utils.data_generator import data_generator
+
+def build_manager(units_per_type=10, seed=42):
+    """Resource manager with a fixed fleet spread over the default graph"""
+    random.seed(seed)
+    manager = ResourceManager()
+    for resource_type in RESOURCE_TYPES:
+        for _ in range(units_per_type):
+            resource = data_generator.generate_resource(resource_type)
+            manager.add_resource(resource_type, resource["location"], resource["capacity"])
+    return manager
+
+def run(num_threads, dispatches_per_thread=300, units_per_type=10):
+    """
+    Each thread repeatedly claims the nearest unit for a random incident
+    and releases a previous claim, so dispatchers keep racing for units.
+    Returns: dict with throughput and conflict-retry rate
+    """
+    manager = build_manager(units_per_type)
+    locations = sorted(manager.route_graph.nodes)
+    types = list(RESOURCE_TYPES)
+    barrier = threading.Barrier(num_threads + 1)
+    
+    def worker(worker_id):
+        rng = random.Random(worker_id)
+        held = []
+        barrier.wait()
+        for i in range(dispatches_per_thread):
+            emergency_id = f"BENCH{worker_id}-{i}"
+            resource, _, _ = manager.dispatch_nearest(
+                emergency_id, rng.choice(locations), rng.choice(types)
+            )
+            if resource:
+                held.append((resource["id"], emergency_id))
+            if len(held) > units_per_type // 2:
+                manager.release_resource(*held.pop(0))
+    
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    
+    stats = manager.dispatch_stats
+    return {
+        "threads": num_threads,
+        "assigned": stats["assigned"],
+        "assignments_per_sec": stats["assigned"] / elapsed if elapsed else 0,
+        "conflict_rate": stats["conflicts"] / stats["attempts"] if stats["attempts"] else 0,
+    }
+
+def main():
+    print(f"{'threads':>8} {'assigned':>9} {'assign/s':>10} {'conflict %':>11}")
+    for num_threads in (1, 2, 4, 8):
+        result = run(num_threads)
+        print(
+            f"{result['threads']:>8} {result['assigned']:>9} "
+            f"{result['assignments_per_sec']:>10.0f} {result['conflict_rate'] * 100:>10.2f}%"
+        )
+
+if __name__ == "__main__":
+    main()
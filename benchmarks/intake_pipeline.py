@@ -0,0 +1,53 @@
+# benchmarks/intake_pipeline.py - Asyncio intake throughput and latency
+#
+# Run from the project root:
+#     python -m benchmarks.intake_pipeline
+
+import asyncio
+import random
+import shutil
+import tempfile
+import time
+
+from core import EmergencyManager, IntakePipeline
+from utils.data_generator import data_generator
+
+async def produce(pipeline, reports, producers):
+    async def producer(chunk):
+        for emergency in chunk:
+            await pipeline.submit(emergency)
+    
+    await pipeline.start()
+    await asyncio.gather(*(producer(reports[p::producers]) for p in range(producers)))
+    await pipeline.stop()
+
+def run(batch_size, count=5000, producers=50):
+    """Commit count reports through the pipeline into a WAL-backed manager"""
+    random.seed(11)
+    storage_dir = tempfile.mkdtemp()
+    manager = EmergencyManager(storage_dir=storage_dir)
+    manager.max_active = count
+    manager.dedup.window = 0  # every report is a distinct incident
+    reports = [data_generator.generate_emergency() for _ in range(count)]
+    
+    pipeline = IntakePipeline(manager, batch_size=batch_size)
+    start = time.perf_counter()
+    asyncio.run(produce(pipeline, reports, producers))
+    elapsed = time.perf_counter() - start
+    
+    manager.close()
+    shutil.rmtree(storage_dir)
+    return elapsed, pipeline.get_metrics()
+
+def main():
+    print(f"{'batch':>6} {'reports/s':>10} {'avg batch':>10} {'p50 ms':>8} {'p99 ms':>8} {'max depth':>10}")
+    for batch_size in (1, 8, 64, 256):
+        elapsed, metrics = run(batch_size)
+        latency = metrics["latency_ms"]
+        print(
+            f"{batch_size:>6} {metrics['committed'] / elapsed:>10.0f} {metrics['avg_batch_size']:>10.1f} "
+            f"{latency['p50']:>8.2f} {latency['p99']:>8.2f} {metrics['max_queue_depth']:>10}"
+        )
+
+if __name__ == "__main__":
+    main()
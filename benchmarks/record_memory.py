@@ -0,0 +1,49 @@
+# benchmarks/record_memory.py - Memory per incident: dict vs slotted record
+#
+# Run from the project root:
+#     python -m benchmarks.record_memory
+
+import random
+import tracemalloc
+
+from core import EmergencyManager
+from core.records import EmergencyRecord
+from utils.data_generator import data_generator
+
+def measure(build, count):
+    """Bytes per incident still allocated after build() consumed fresh reports"""
+    random.seed(7)
+    
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build([data_generator.generate_emergency() for _ in range(count)])
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    
+    del kept
+    return (after - before) / count
+
+def as_dicts(emergencies):
+    return emergencies
+
+def as_records(emergencies):
+    return [EmergencyRecord.from_dict(e) for e in emergencies]
+
+def into_manager(emergencies):
+    manager = EmergencyManager()
+    manager.max_active = len(emergencies)
+    for emergency in emergencies:
+        manager.report_emergency(emergency, dedup=False)
+    return manager
+
+def main(count=20000):
+    print(f"{'form':<22} {'bytes/incident':>15}")
+    for name, build in (
+        ("dict", as_dicts),
+        ("EmergencyRecord", as_records),
+        ("EmergencyManager", into_manager),
+    ):
+        print(f"{name:<22} {measure(build, count):>15.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+# benchmarks/shard_throughput.py - City-sharded core: throughput vs workers
+#
+# Run from the project root:
+#     python -m benchmarks.shard_throughput
+
+import random
+import time
+
+from core.sharding import ShardCoordinator
+from utils.data_generator import data_generator
+
+def run(workers, reports, chunk=500):
+    """Report (and dispatch) every report through a coordinator with N workers"""
+    coordinator = ShardCoordinator(
+        workers,
+        max_active=2 * len(reports),  # above the low-priority soft limit: nothing spooled
+        units_per_type=20,
+        dedup=False,  # every report is a distinct incident
+    )
+    
+    start = time.perf_counter()
+    for i in range(0, len(reports), chunk):
+        coordinator.report_many(reports[i:i + chunk], dispatch=True)
+    elapsed = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    coordinator.get_top_emergencies(10)
+    totals = coordinator.get_totals()
+    query_ms = (time.perf_counter() - start) * 1000
+    
+    coordinator.close()
+    return elapsed, query_ms, totals
+
+def main(count=20000):
+    random.seed(5)
+    reports = [data_generator.generate_emergency() for _ in range(count)]
+    
+    print(f"{'workers':>8} {'reports/s':>10} {'speedup':>8} {'gather ms':>10} {'active':>8}")
+    baseline = None
+    for workers in (1, 2, 4, 8):
+        elapsed, query_ms, totals = run(workers, reports)
+        rate = count / elapsed
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>10.0f} {rate / baseline:>8.2f} {query_ms:>10.2f} {totals['total_active']:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,7 @@
 # config.py - Configuration Settings
 
+import os
+
 # Application Settings
 APP_TITLE = "CrisisFlow Advanced - Real-time Disaster Management System"
 APP_VERSION = "2.0"
@@ -61,16 +63,62 @@ MUMBAI_AREAS = [
     "Goregaon", "Kandivali", "Santacruz", "Chembur", "Ghatkopar"
 ]
 
+# Approximate coordinates (latitude, longitude) for spatial indexing
+CITY_COORDINATES = {
+    "Mumbai": (19.0760, 72.8777), "Delhi": (28.6139, 77.2090),
+    "Bangalore": (12.9716, 77.5946), "Hyderabad": (17.3850, 78.4867),
+    "Chennai": (13.0827, 80.2707), "Kolkata": (22.5726, 88.3639),
+    "Pune": (18.5204, 73.8567), "Ahmedabad": (23.0225, 72.5714),
+    "Jaipur": (26.9124, 75.7873), "Lucknow": (26.8467, 80.9462),
+    "Chandigarh": (30.7333, 76.7794), "Bhopal": (23.2599, 77.4126),
+    "Patna": (25.5941, 85.1376), "Indore": (22.7196, 75.8577),
+    "Kochi": (9.9312, 76.2673),
+}
+
+MUMBAI_AREA_COORDINATES = {
+    "Andheri West": (19.1364, 72.8296), "Andheri East": (19.1136, 72.8697),
+    "Bandra": (19.0596, 72.8295), "Borivali": (19.2307, 72.8567),
+    "Dadar": (19.0178, 72.8478), "Kurla": (19.0726, 72.8845),
+    "Malad": (19.1874, 72.8484), "Powai": (19.1176, 72.9060),
+    "Vashi": (19.0771, 72.9986), "Thane": (19.2183, 72.9781),
+    "Worli": (19.0176, 72.8170), "Lower Parel": (18.9986, 72.8302),
+    "Colaba": (18.9067, 72.8147), "Marine Drive": (18.9440, 72.8238),
+    "Juhu": (19.1075, 72.8263), "Goregaon": (19.1663, 72.8526),
+    "Kandivali": (19.2045, 72.8376), "Santacruz": (19.0810, 72.8416),
+    "Chembur": (19.0522, 72.9005), "Ghatkopar": (19.0860, 72.9081),
+}
+
 # Data Generation Settings
 SIMULATION_INTERVAL = 3000  # milliseconds
 MAX_ACTIVE_EMERGENCIES = 50
+ADMISSION_CRITICAL_PRIORITY = 2  # priorities up to this are always admitted
+ADMISSION_LOW_PRIORITY = 4  # priorities from this are spooled at the soft limit
+ADMISSION_SOFT_LIMIT = 0.8  # share of MAX_ACTIVE_EMERGENCIES open to low priorities
 HISTORY_RETENTION_DAYS = 30
+DEDUP_WINDOW_MINUTES = 10  # reports of one type/location this close are merged (0 disables)
+DEDUP_SIMILARITY = 0.0  # min description word overlap to merge (0 disables)
+INTAKE_QUEUE_SIZE = 1000  # bounded asyncio intake queue (producers wait when full)
+INTAKE_BATCH_SIZE = 64  # most reports committed per intake batch
+INTAKE_BATCH_MS = 10  # longest wait for a batch to fill
+CHANGE_FEED_RETENTION = 10000  # recent deltas kept for cursor reads
+SHARD_WORKERS = 4  # worker processes for the city-sharded core
 
 # Graph Settings (for routes)
 DEFAULT_GRAPH_NODES = 30
 DEFAULT_GRAPH_EDGES = 60
 MIN_DISTANCE = 1
 MAX_DISTANCE = 50
+SPATIAL_CELL_SIZE = 25  # km per grid cell for the resource spatial index
+SPATIAL_MIN_AIR_RATIO = 0.5  # below this route/air distance ratio the grid can't prune; scan instead
+PREEMPTION_PRIORITY = 1  # incidents at or above this urgency may preempt
+PREEMPTION_MAX_DISTANCE = 100  # km search bound for preemption candidates
+ALLOCATION_MAX_UNITS = 10  # most units of one type sent to a single incident
+
+# Storage Settings
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+WAL_SNAPSHOT_EVERY = 500  # WAL records between emergency-state snapshots
+HISTORY_BACKEND = "memory"  # "memory" or "sqlite" (resolved history store)
+HISTORY_BATCH_SIZE = 100  # resolved records per SQLite transaction
 
 # Analytics Settings
 CHART_UPDATE_INTERVAL = 5000  # milliseconds
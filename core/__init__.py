@@ -3,5 +3,7 @@
 from .emergency_manager import EmergencyManager
 from .resource_manager import ResourceManager
 from .analytics_engine import AnalyticsEngine
+from .intake import IntakePipeline
+from .change_feed import ChangeFeed
 
-__all__ = ['EmergencyManager', 'ResourceManager', 'AnalyticsEngine']
\ No newline at end of file
+__all__ = ['EmergencyManager', 'ResourceManager', 'AnalyticsEngine', 'IntakePipeline', 'ChangeFeed']
\ No newline at end of file
@@ -3,6 +3,7 @@
 from datetime import datetime, timedelta
 from collections import defaultdict
 import random
+import time
 
 class AnalyticsEngine:
     """
@@ -13,8 +14,27 @@ class AnalyticsEngine:
         self.emergency_manager = emergency_manager
         self.historical_data = []
         self.predictions = []
+        self._cache = {}  # (name, args) -> ((change feed version, minute), result)
+    
+    def _memo(self, name, args, compute):
+        """
+        Reuse a result until the change feed reports a new delta, or the
+        minute turns (time windows keep sliding while the feed is idle)
+        """
+        version = (self.emergency_manager.changes.version, int(time.time() // 60))
+        cached = self._cache.get((name, args))
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        
+        result = compute()
+        self._cache[(name, args)] = (version, result)
+        return result
     
     def analyze_trends(self, days=7):
+        """Trends over the last days (cached until something changes)"""
+        return self._memo("trends", (days,), lambda: self._analyze_trends(days))
+    
+    def _analyze_trends(self, days):
         """
         Analyze emergency trends over time
         Returns: trends data for visualization
@@ -29,16 +49,9 @@ class AnalyticsEngine:
         
         cutoff = datetime.now() - timedelta(days=days)
         
-        # Analyze resolved emergencies
-        all_resolved = []
-        for emergency_type in self.emergency_manager.resolved_tree.get_all_keys():
-            emergencies = self.emergency_manager.resolved_tree.search(emergency_type)
-            all_resolved.extend(emergencies)
-        
-        for emergency in all_resolved:
-            timestamp = emergency.get("timestamp")
-            if not timestamp or timestamp < cutoff:
-                continue
+        # Analyze resolved emergencies inside the window (time index)
+        for emergency in self.emergency_manager.get_resolved_since(cutoff):
+            timestamp = emergency["timestamp"]
             
             # Daily counts
             date_key = timestamp.strftime("%Y-%m-%d")
@@ -63,6 +76,10 @@ class AnalyticsEngine:
         return trends
     
     def get_hotspots(self, limit=10):
+        """Top locations (cached until something changes)"""
+        return self._memo("hotspots", (limit,), lambda: self._get_hotspots(limit))
+    
+    def _get_hotspots(self, limit):
         """
         Identify emergency hotspots (locations with most incidents)
         Returns: list of (location, count) tuples
@@ -74,18 +91,10 @@ class AnalyticsEngine:
             location = emergency.get("location", "Unknown")
             location_counts[location] += 1
         
-        # Count recent resolved
-        all_resolved = []
-        for emergency_type in self.emergency_manager.resolved_tree.get_all_keys():
-            emergencies = self.emergency_manager.resolved_tree.search(emergency_type)
-            all_resolved.extend(emergencies)
-        
+        # Count recent resolved (aggregated by the history store)
         cutoff = datetime.now() - timedelta(days=7)
-        for emergency in all_resolved:
-            timestamp = emergency.get("timestamp")
-            if timestamp and timestamp >= cutoff:
-                location = emergency.get("location", "Unknown")
-                location_counts[location] += 1
+        for location, count in self.emergency_manager.get_resolved_location_counts(cutoff).items():
+            location_counts[location] += count
         
         # Sort and return top locations
         hotspots = sorted(location_counts.items(), key=lambda x: x[1], reverse=True)
@@ -96,26 +105,7 @@ class AnalyticsEngine:
         Calculate response time metrics
         Returns: dict with avg, min, max response times
         """
-        response_times = []
-        
-        all_resolved = []
-        for emergency_type in self.emergency_manager.resolved_tree.get_all_keys():
-            emergencies = self.emergency_manager.resolved_tree.search(emergency_type)
-            all_resolved.extend(emergencies)
-        
-        for emergency in all_resolved:
-            if "resolution_time" in emergency:
-                response_times.append(emergency["resolution_time"])
-        
-        if not response_times:
-            return {"avg": 0, "min": 0, "max": 0, "count": 0}
-        
-        return {
-            "avg": sum(response_times) / len(response_times),
-            "min": min(response_times),
-            "max": max(response_times),
-            "count": len(response_times)
-        }
+        return self._memo("response", (), self.emergency_manager.get_response_summary)
     
     def predict_next_emergency(self):
         """
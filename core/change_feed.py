@@ -0,0 +1,103 @@
+# core/change_feed.py - Versioned change feed shared by the managers
+
+import threading
+import time
+from collections import deque, namedtuple
+from config import CHANGE_FEED_RETENTION
+
+# One change: version is global and strictly increasing across publishers;
+# key names the entity it touches, e.g. ("emergency", "EMG1001")
+Delta = namedtuple("Delta", ["version", "kind", "key", "data", "time"])
+
+class ChangeFeed:
+    """
+    Append-only, monotonically versioned log of typed deltas.
+    Consumers keep a cursor (the last version they applied) and read
+    newer deltas; a bounded window of recent deltas is retained.
+    Readers whose cursor fell out of the window get None and should
+    reload state from the managers and resume at feed.version.
+    """
+    
+    def __init__(self, retention=CHANGE_FEED_RETENTION):
+        self.version = 0
+        self.deltas = deque(maxlen=retention)
+        self._lock = threading.Lock()
+    
+    def publish(self, kind, key, data):
+        """Append a delta, returns its version"""
+        with self._lock:
+            self.version += 1
+            self.deltas.append(Delta(self.version, kind, key, data, time.time()))
+            return self.version
+    
+    def _floor(self):
+        """Oldest cursor that can still be served in full"""
+        return self.deltas[0].version - 1 if self.deltas else self.version
+    
+    def read(self, cursor, limit=None):
+        """
+        Deltas with version > cursor, oldest first (at most limit).
+        Returns None if cursor is older than the retained window.
+        """
+        with self._lock:
+            if cursor < self._floor():
+                return None
+            # Versions are contiguous, so the start offset is arithmetic
+            start = len(self.deltas) - (self.version - cursor)
+            end = len(self.deltas) if limit is None else min(len(self.deltas), start + limit)
+            return [self.deltas[i] for i in range(max(start, 0), end)]
+    
+    def since(self, cursor):
+        """
+        Compacted deltas after cursor: one per key, carrying the key's
+        latest kind and merged data. A "reported" key that was later only
+        reprioritised or merged stays "reported" so late joiners add it.
+        Returns None if cursor is older than the retained window.
+        """
+        deltas = self.read(cursor)
+        if deltas is None:
+            return None
+        
+        compacted = {}
+        for delta in deltas:
+            previous = compacted.pop(delta.key, None)
+            if previous is None:
+                compacted[delta.key] = delta
+                continue
+            
+            kind = delta.kind
+            if previous.kind == "reported" and kind in ("reprioritised", "merged"):
+                kind = "reported"
+            compacted[delta.key] = Delta(
+                delta.version, kind, delta.key, {**previous.data, **delta.data}, delta.time
+            )
+        return list(compacted.values())
+    
+    def subscribe(self, cursor=None):
+        """Subscription starting at cursor (default: only future deltas)"""
+        return Subscription(self, self.version if cursor is None else cursor)
+
+
+class Subscription:
+    """A consumer's cursor into a ChangeFeed"""
+    
+    def __init__(self, feed, cursor):
+        self.feed = feed
+        self.cursor = cursor
+    
+    def poll(self, limit=None):
+        """
+        New deltas since the last poll, advancing the cursor.
+        Returns None (and jumps to the head) if deltas were lost;
+        the consumer should then rebuild its view from scratch.
+        """
+        deltas = self.feed.read(self.cursor, limit)
+        if deltas is None:
+            self.cursor = self.feed.version
+            return None
+        if deltas:
+            self.cursor = deltas[-1].version
+        return deltas
+    
+    def pending(self):
+        return self.feed.version - self.cursor
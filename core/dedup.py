@@ -0,0 +1,81 @@
+# core/dedup.py - Duplicate report detection at intake
+
+import re
+from config import DEDUP_WINDOW_MINUTES, DEDUP_SIMILARITY
+
+def normalize_location(location):
+    """Case, punctuation and spacing-insensitive form of a location"""
+    return re.sub(r"[^a-z0-9]+", " ", str(location).lower()).strip()
+
+def description_similarity(a, b):
+    """Jaccard similarity of the word sets of two descriptions"""
+    words_a = set(re.findall(r"[a-z0-9]+", (a or "").lower()))
+    words_b = set(re.findall(r"[a-z0-9]+", (b or "").lower()))
+    if not words_a or not words_b:
+        return 1.0  # nothing to compare - location, type and time decide
+    return len(words_a & words_b) / len(words_a | words_b)
+
+class DuplicateDetector:
+    """
+    Time-bucketed hash of active incidents on (normalised location, type).
+    A report is a duplicate of an incident at the same place, of the same
+    type, reported within the window and - if a similarity threshold is
+    set - with a similar enough description. Only the report's bucket
+    and the one before it are probed, so detection is O(1) per report.
+    """
+    
+    def __init__(self, window_minutes=DEDUP_WINDOW_MINUTES, similarity=DEDUP_SIMILARITY):
+        self.window = window_minutes * 60
+        self.similarity = similarity
+        self.buckets = {}  # (location, type, bucket) -> {emergency_id: emergency}
+        self._keys = {}  # emergency_id -> its bucket key
+    
+    def _seconds(self, emergency):
+        timestamp = emergency.get("timestamp")
+        return timestamp.timestamp() if timestamp else 0
+    
+    def _key(self, emergency, seconds):
+        return (
+            normalize_location(emergency["location"]),
+            emergency["type"],
+            int(seconds // self.window) if self.window else 0,
+        )
+    
+    def add(self, emergency):
+        key = self._key(emergency, self._seconds(emergency))
+        self.buckets.setdefault(key, {})[emergency["id"]] = emergency
+        self._keys[emergency["id"]] = key
+    
+    def remove(self, emergency):
+        key = self._keys.pop(emergency["id"], None)
+        if key is None:
+            return
+        bucket = self.buckets[key]
+        bucket.pop(emergency["id"], None)
+        if not bucket:
+            del self.buckets[key]
+    
+    def find(self, emergency):
+        """The closest-in-time incident this report duplicates, or None"""
+        if self.window <= 0:
+            return None
+        
+        seconds = self._seconds(emergency)
+        location, emergency_type, bucket = self._key(emergency, seconds)
+        
+        best, best_gap = None, None
+        for b in (bucket, bucket - 1):
+            for candidate in self.buckets.get((location, emergency_type, b), {}).values():
+                gap = abs(seconds - self._seconds(candidate))
+                if gap > self.window:
+                    continue
+                if self.similarity and description_similarity(
+                    emergency.get("description"), candidate.get("description")
+                ) < self.similarity:
+                    continue
+                if best is None or gap < best_gap:
+                    best, best_gap = candidate, gap
+        return best
+    
+    def __len__(self):
+        return len(self._keys)
@@ -1,30 +1,50 @@
 # FIXED: core/emergency_manager.py
 
+import os
+import pickle
 from datetime import datetime, timedelta
-from data_structures import EmergencyHeap, BST, HashTable, Trie, LinkedList
+from data_structures import EmergencyHeap, HashTable, MultiMap, Trie
 from utils.data_generator import data_generator
+from core.persistence import WriteAheadLog
+from core.history_store import MemoryHistoryStore, SQLiteHistoryStore
+from core.spool import OverflowSpool
+from core.records import EmergencyRecord
+from core.dedup import DuplicateDetector
+from core.change_feed import ChangeFeed
+from config import (WAL_SNAPSHOT_EVERY, HISTORY_BACKEND, HISTORY_BATCH_SIZE, MAX_ACTIVE_EMERGENCIES,
+                    ADMISSION_CRITICAL_PRIORITY, ADMISSION_LOW_PRIORITY, ADMISSION_SOFT_LIMIT)
 
 class EmergencyManager:
     """Central manager for all emergency operations"""
     
-    def __init__(self):
+    def __init__(self, storage_dir=None, history_backend=HISTORY_BACKEND, change_feed=None):
+        if storage_dir:
+            os.makedirs(storage_dir, exist_ok=True)
+        
         # Active emergencies (priority queue)
         self.active_heap = EmergencyHeap()
         
-        # Resolved emergencies (BST by type)
-        self.resolved_tree = BST()
+        # Resolved emergencies: in-memory (AVL tree by type, history linked
+        # list, timestamp index) or a SQLite database
+        if history_backend == "sqlite":
+            path = os.path.join(storage_dir, "history.db") if storage_dir else ":memory:"
+            self.resolved = SQLiteHistoryStore(path, batch_size=HISTORY_BATCH_SIZE)
+        else:
+            self.resolved = MemoryHistoryStore()
         
-        # Fast lookup by location (Hash Table)
-        self.location_index = HashTable(size=100)
+        # Active emergencies by location (multimap, pruned on resolve);
+        # resolved ones are looked up through the history store
+        self.location_index = MultiMap(size=100)
         
-        # Fast lookup by ID (Hash Table)
+        # Active emergencies by ID (Hash Table, pruned on resolve)
         self.id_index = HashTable(size=100)
         
         # Location autocomplete (Trie) - FIXED
         self.location_trie = Trie()
+        self._trie_locations = set()  # locations already in the trie
         
-        # History linked list - ADDED
-        self.history_list = LinkedList()
+        # Active incidents by (location, type, time bucket) for dedup
+        self.dedup = DuplicateDetector()
         
         # Statistics
         self.stats = {
@@ -33,11 +53,171 @@ class EmergencyManager:
             "total_active": 0,
             "avg_response_time": 0,
             "by_type": {},
-            "by_priority": {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
+            "by_priority": {1: 0, 2: 0, 3: 0, 4: 0, 5: 0},
+            "duplicates_merged": 0
         }
+        
+        # Admission control: overflow waits in a disk-backed spool
+        self.max_active = MAX_ACTIVE_EMERGENCIES
+        self.spool = OverflowSpool(
+            os.path.join(storage_dir, "spool.db") if storage_dir else ":memory:"
+        )
+        self._readmitted = []  # re-admitted since take_readmitted(), awaiting dispatch
+        self.spool_stats = {
+            "spooled": 0,
+            "readmitted": 0,
+            "spooled_by_priority": {},
+            "total_wait": 0.0,
+            "max_wait": 0.0
+        }
+        
+        # Typed deltas for subscribers (may be shared with ResourceManager)
+        self.changes = change_feed if change_feed is not None else ChangeFeed()
+        
+        # Durability (write-ahead log + periodic snapshots)
+        self.wal = None
+        self.recovered = False
+        self._replaying = False
+        self._since_snapshot = 0
+        self._history_pending = []  # resolved since the last snapshot (memory store)
+        self._batch = None  # pickled records buffered by report_batch
+        if storage_dir:
+            self.wal = WriteAheadLog(os.path.join(storage_dir, "wal"))
+            self._recover()
+            self._readmit()
+    
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    
+    def _publish(self, kind, emergency_id, data):
+        """Publish a delta (not while replaying recovered history)"""
+        if not self._replaying:
+            self.changes.publish(kind, ("emergency", emergency_id), data)
+    
+    def _log(self, *record):
+        """Append a state change to the WAL (no-op while replaying)"""
+        if self.wal is None or self._replaying:
+            return
+        
+        if self._batch is not None:
+            # Captured now: later records in the batch may mutate the same incident
+            self._batch.append(pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL))
+            return
+        
+        self.wal.append(record)
+        self._since_snapshot += len(record[1]) if record[0] == "batch" else 1
+        if self._since_snapshot >= WAL_SNAPSHOT_EVERY:
+            self.snapshot()
+    
+    def snapshot(self):
+        """
+        Write a compact snapshot so recovery replays only newer records.
+        Resolved history is appended incrementally, so the cost is bounded
+        by the active set, not by the history size.
+        """
+        if self.wal is None:
+            return None
+        
+        self._since_snapshot = 0
+        self.resolved.flush()
+        history, self._history_pending = self._history_pending, []
+        return self.wal.snapshot({
+            "active": self.active_heap.get_all(),
+            "stats": self.stats,
+            "emergency_counter": data_generator.emergency_counter,
+        }, history)
+    
+    def _recover(self):
+        """Rebuild state from the latest snapshot plus the WAL tail"""
+        state, history, records = self.wal.recover()
+        
+        for emergency in history:
+            self._index_location_words(emergency["location"])
+            self.resolved.add(emergency)
+        
+        if state is not None:
+            self.stats = state["stats"]
+            data_generator.emergency_counter = max(
+                data_generator.emergency_counter, state.get("emergency_counter", 0)
+            )
+            for emergency in state["active"]:
+                self.active_heap.push(emergency)
+                self._index_active(emergency)
+        
+        self._replaying = True
+        try:
+            for record in records:
+                self._replay(record)
+        finally:
+            self._replaying = False
+        
+        self.recovered = state is not None or bool(records)
+    
+    def _replay(self, record):
+        """Re-apply one WAL record"""
+        kind, args = record[0], record[1:]
+        if kind == "report":
+            emergency_id = self.report_emergency(*args)
+            
+            # Keep newly generated IDs clear of recovered ones
+            digits = "".join(ch for ch in str(emergency_id) if ch.isdigit())
+            if digits:
+                data_generator.emergency_counter = max(data_generator.emergency_counter, int(digits))
+        elif kind == "resolve":
+            self.resolve_emergency(*args)
+        elif kind == "priority":
+            self.update_priority(*args)
+        elif kind == "assign":
+            self.record_assignment(*args)
+        elif kind == "merge":
+            self._merge_report(*args)
+        elif kind == "batch":
+            for payload in args[0]:
+                self._replay(pickle.loads(payload))
+    
+    def close(self):
+        """Flush the WAL and history store - call on shutdown"""
+        self.resolved.close()
+        self.spool.close()
+        if self.wal is not None:
+            self.wal.close()
+    
+    # ------------------------------------------------------------------
+    # Indexing
+    # ------------------------------------------------------------------
+    
+    def _index_active(self, emergency):
+        """Add an active emergency to the ID, location and autocomplete indexes"""
+        self.id_index.insert(emergency["id"], emergency)
+        self.location_index.add(emergency["location"], emergency["id"], emergency)
+        self.dedup.add(emergency)
+        if emergency["location"] not in self._trie_locations:
+            self._index_location_words(emergency["location"])
+    
+    def _unindex_active(self, emergency):
+        """Drop a no-longer-active emergency from the ID and location indexes"""
+        self.id_index.delete(emergency["id"])
+        self.location_index.remove(emergency["location"], emergency["id"])
+        self.dedup.remove(emergency)
     
-    def report_emergency(self, emergency_data):
-        """Report a new emergency - ENHANCED"""
+    def _index_location_words(self, location):
+        """Add a location to the autocomplete trie"""
+        self._trie_locations.add(location)
+        
+        # Add location to trie - FIXED - Add each word
+        location_words = location.lower().split()
+        for word in location_words:
+            self.location_trie.insert(word, {"location": location})
+        # Also add full location
+        self.location_trie.insert(location.lower(), {"location": location})
+    
+    def report_emergency(self, emergency_data, dedup=True):
+        """
+        Report a new emergency - ENHANCED
+        A duplicate of an active incident is merged into it and the
+        existing ID is returned (pass dedup=False to skip the check).
+        """
         # Generate emergency if not complete
         if "id" not in emergency_data:
             emergency = data_generator.generate_emergency(
@@ -47,30 +227,77 @@ class EmergencyManager:
         else:
             emergency = emergency_data
         
+        # Compact slotted record (dict-compatible)
+        emergency = EmergencyRecord.from_dict(emergency)
+        
         # Add timestamp if missing
         if "timestamp" not in emergency:
             emergency["timestamp"] = datetime.now()
         
-        # Add to active queue
-        self.active_heap.push(emergency)
+        # Dedup: fold repeat reports of one incident into it
+        if dedup and not self._replaying:
+            original = self.dedup.find(emergency)
+            if original is not None:
+                self._merge_report(original["id"], emergency.get("affected_people") or 0)
+                return original["id"]
         
-        # Index by ID
-        self.id_index.insert(emergency["id"], emergency)
+        # Backpressure: spool instead of growing the active set
+        if not self._replaying and not self._can_admit(emergency.get("priority", 5)):
+            emergency["status"] = "spooled"
+            self.spool.push(emergency)
+            
+            priority = emergency.get("priority", 5)
+            by_priority = self.spool_stats["spooled_by_priority"]
+            by_priority[priority] = by_priority.get(priority, 0) + 1
+            self.spool_stats["spooled"] += 1
+            return emergency["id"]
         
-        # Index by location - FIXED
-        location = emergency["location"]
-        existing = self.location_index.get(location)
-        if existing is None:
-            existing = []
-        existing.append(emergency)
-        self.location_index.insert(location, existing)
+        return self._admit(emergency)
+    
+    def report_batch(self, batch, dedup=True):
+        """
+        Report several emergencies as one commit: a single WAL record
+        covers the whole batch. Returns one ID (or exception) per item.
+        """
+        self._batch = []
+        results = []
+        try:
+            for emergency_data in batch:
+                try:
+                    results.append(self.report_emergency(emergency_data, dedup))
+                except Exception as exc:
+                    results.append(exc)
+        finally:
+            records, self._batch = self._batch, None
+            if records:
+                self._log("batch", records)
+        return results
+    
+    def _merge_report(self, emergency_id, affected_people):
+        """Add a duplicate report's casualties to the incident it repeats"""
+        emergency = self.id_index.get(emergency_id)
+        if not emergency:
+            return None
         
-        # Add location to trie - FIXED - Add each word
-        location_words = location.lower().split()
-        for word in location_words:
-            self.location_trie.insert(word, {"location": location})
-        # Also add full location
-        self.location_trie.insert(location.lower(), {"location": location})
+        emergency["affected_people"] = (emergency.get("affected_people") or 0) + affected_people
+        emergency["merged_reports"] = emergency.get("merged_reports", 0) + 1
+        self.stats["duplicates_merged"] = self.stats.get("duplicates_merged", 0) + 1
+        self._publish("merged", emergency_id, {
+            "affected_people": emergency["affected_people"],
+            "merged_reports": emergency["merged_reports"]
+        })
+        
+        self._log("merge", emergency_id, affected_people)
+        return emergency
+    
+    def _admit(self, emergency):
+        """Make an emergency active and index it"""
+        if emergency.get("status") == "spooled":
+            emergency["status"] = "active"
+        
+        # Add to active queue
+        self.active_heap.push(emergency)
+        self._index_active(emergency)
         
         # Update stats
         self.stats["total_reported"] += 1
@@ -82,10 +309,14 @@ class EmergencyManager:
         priority = emergency["priority"]
         self.stats["by_priority"][priority] = self.stats["by_priority"].get(priority, 0) + 1
         
+        self._log("report", emergency)
+        # The record itself, not a copy: the feed retains thousands of
+        # deltas, so readers see its current fields (it is dict-compatible)
+        self._publish("reported", emergency["id"], emergency)
         return emergency["id"]
     
-    def resolve_emergency(self, emergency_id=None):
-        """Resolve an emergency - ENHANCED"""
+    def resolve_emergency(self, emergency_id=None, resolved_at=None):
+        """Resolve an emergency - ENHANCED (resolved_at is used by WAL replay)"""
         if emergency_id:
             emergency = self.active_heap.remove_by_id(emergency_id)
         else:
@@ -94,19 +325,19 @@ class EmergencyManager:
         if not emergency:
             return None
         
+        self._unindex_active(emergency)
+        
         # Mark as resolved
         emergency["status"] = "resolved"
-        emergency["resolved_at"] = datetime.now()
+        emergency["resolved_at"] = resolved_at or datetime.now()
         
         if "timestamp" in emergency:
             time_diff = emergency["resolved_at"] - emergency["timestamp"]
             emergency["resolution_time"] = time_diff.total_seconds() / 60  # minutes
         
-        # Add to resolved tree (indexed by type)
-        self.resolved_tree.insert(emergency["type"], emergency)
-        
-        # Add to history linked list - ADDED
-        self.history_list.append(emergency)
+        self.resolved.add(emergency)
+        if self.wal is not None and not self.resolved.durable:
+            self._history_pending.append(emergency)
         
         # Update stats
         self.stats["total_resolved"] += 1
@@ -119,8 +350,71 @@ class EmergencyManager:
             new_avg = ((current_avg * (total_resolved - 1)) + emergency["resolution_time"]) / total_resolved
             self.stats["avg_response_time"] = new_avg
         
+        self._log("resolve", emergency["id"], emergency["resolved_at"])
+        self._publish("resolved", emergency["id"], {
+            "status": "resolved",
+            "resolved_at": emergency["resolved_at"],
+            "resolution_time": emergency.get("resolution_time")
+        })
+        self._readmit()
         return emergency
     
+    # ------------------------------------------------------------------
+    # Admission control
+    # ------------------------------------------------------------------
+    
+    def _admission_limit(self, priority):
+        """Active-set size at which a priority is spooled (None = never)"""
+        if priority <= ADMISSION_CRITICAL_PRIORITY:
+            return None
+        if priority >= ADMISSION_LOW_PRIORITY:
+            # Keep headroom free for more urgent incidents
+            return int(self.max_active * ADMISSION_SOFT_LIMIT)
+        return self.max_active
+    
+    def _can_admit(self, priority):
+        limit = self._admission_limit(priority)
+        return limit is None or self.active_heap.size() < limit
+    
+    def _readmit(self):
+        """Admit spooled emergencies, most urgent first, while capacity allows"""
+        if self._replaying:
+            return
+        
+        while len(self.spool):
+            # Limits only tighten for less urgent incidents, so stop at the
+            # first head that does not fit
+            priority = self.spool.peek_priority()
+            if priority is None or not self._can_admit(priority):
+                break
+            
+            emergency, waited = self.spool.pop()
+            if emergency is None:
+                break
+            
+            emergency["spooled_for"] = waited
+            self.spool_stats["readmitted"] += 1
+            self.spool_stats["total_wait"] += waited
+            self.spool_stats["max_wait"] = max(self.spool_stats["max_wait"], waited)
+            self._admit(emergency)
+            self._readmitted.append(emergency)
+    
+    def take_readmitted(self):
+        """Incidents re-admitted from the spool since the last call (to dispatch)"""
+        readmitted, self._readmitted = self._readmitted, []
+        return readmitted
+    
+    def get_spool_stats(self):
+        """Counters for spooled incidents and how long they waited"""
+        readmitted = self.spool_stats["readmitted"]
+        return {
+            **self.spool_stats,
+            "depth": len(self.spool),
+            "waiting_by_priority": self.spool.depth_by_priority(),
+            "avg_wait": self.spool_stats["total_wait"] / readmitted if readmitted else 0,
+            "max_active": self.max_active
+        }
+    
     def get_active_emergencies(self, priority=None):
         """Get all active emergencies"""
         if priority:
@@ -129,11 +423,20 @@ class EmergencyManager:
     
     def get_emergency_by_id(self, emergency_id):
         """Get emergency by ID"""
-        return self.id_index.get(emergency_id)
+        emergency = self.id_index.get(emergency_id)
+        if emergency is None:
+            emergency = self.resolved.get(emergency_id)
+        if emergency is None:
+            emergency = self.spool.get(emergency_id)
+        return emergency
     
     def get_emergencies_by_location(self, location):
-        """Get all emergencies at a location"""
-        return self.location_index.get(location) or []
+        """Get active emergencies at a location"""
+        return self.location_index.get(location)
+    
+    def get_resolved_by_location(self, location):
+        """Get resolved emergencies at a location"""
+        return self.resolved.by_location(location)
     
     def search_locations(self, prefix):
         """Autocomplete location search - FIXED"""
@@ -147,28 +450,57 @@ class EmergencyManager:
     
     def get_resolved_by_type(self, emergency_type):
         """Get all resolved emergencies of a type"""
-        return self.resolved_tree.search(emergency_type)
+        return self.resolved.by_type(emergency_type)
     
     def get_all_resolved(self):
         """Get all resolved emergencies - ADDED"""
-        return self.resolved_tree.inorder()
+        return self.resolved.all()
+    
+    def get_resolved_between(self, start=None, end=None):
+        """Resolved emergencies reported in [start, end) - O(log n + window)"""
+        return self.resolved.between(start, end)
+    
+    def get_resolved_since(self, cutoff):
+        """Resolved emergencies reported at or after cutoff"""
+        return self.resolved.between(cutoff)
+    
+    def get_resolved_location_counts(self, since=None):
+        """Resolved incidents per location reported at or after since"""
+        return self.resolved.count_by_location(since)
+    
+    def get_response_summary(self):
+        """avg/min/max/count of resolution times in minutes"""
+        return self.resolved.response_summary()
     
     def get_history(self):
-        """Get history from linked list - ADDED"""
-        return self.history_list.get_all()
+        """Get history in resolution order - ADDED"""
+        return self.resolved.get_history()
     
     def get_recent_history(self, count=10):
         """Get recent history - ADDED"""
-        return self.history_list.get_last_n(count)
+        return self.resolved.recent(count)
     
     def get_resolved_stats(self):
         """Get statistics about resolved emergencies"""
-        counts = self.resolved_tree.count_by_key()
-        return counts
+        return self.resolved.count_by_type()
     
     def update_priority(self, emergency_id, new_priority):
         """Update priority of an active emergency"""
-        return self.active_heap.update_priority(emergency_id, new_priority)
+        updated = self.active_heap.update_priority(emergency_id, new_priority)
+        if updated:
+            self._log("priority", emergency_id, new_priority)
+            self._publish("reprioritised", emergency_id, {"priority": new_priority})
+        return updated
+    
+    def record_assignment(self, emergency_id, resource_ids):
+        """Store the resources dispatched to an emergency"""
+        emergency = self.id_index.get(emergency_id)
+        if not emergency:
+            return False
+        
+        emergency["assigned_resources"] = list(resource_ids)
+        self._log("assign", emergency_id, list(resource_ids))
+        return True
     
     def get_statistics(self):
         """Get comprehensive statistics"""
@@ -177,11 +509,12 @@ class EmergencyManager:
         return {
             **self.stats,
             "active_by_priority": heap_stats.get("by_priority", {}),
-            "resolved_by_type": self.resolved_tree.count_by_key(),
-            "tree_height": self.resolved_tree.get_height(),
-            "tree_size": self.resolved_tree.size(),
+            "resolved_by_type": self.resolved.count_by_type(),
+            "tree_height": self.resolved.get_height(),
+            "tree_size": self.resolved.size(),
             "hash_stats": self.location_index.get_stats(),
-            "history_count": len(self.history_list)
+            "history_count": self.resolved.size(),
+            "spooled": len(self.spool)
         }
     
     def get_top_emergencies(self, count=5):
@@ -0,0 +1,241 @@
+# core/history_store.py - Storage backends for resolved emergency history
+
+import pickle
+import sqlite3
+import threading
+from datetime import datetime
+from data_structures import AVLTree, LinkedList, MultiMap, SortedIndex
+
+class MemoryHistoryStore:
+    """
+    In-memory resolved history: AVL tree by type, linked list in
+    resolution order, a sorted index by report timestamp and a
+    location multimap.
+    """
+    
+    durable = False  # contents must be captured in EmergencyManager snapshots
+    
+    def __init__(self):
+        self.tree = AVLTree()
+        self.history = LinkedList()
+        self.by_time = SortedIndex()
+        self.locations = MultiMap()
+        self.ids = {}  # emergency_id -> emergency
+    
+    def add(self, emergency):
+        self.tree.insert(emergency["type"], emergency)
+        self.history.append(emergency)
+        if emergency.get("timestamp"):
+            self.by_time.insert(emergency["timestamp"], emergency)
+        self.locations.add(emergency["location"], emergency["id"], emergency)
+        self.ids[emergency["id"]] = emergency
+    
+    def get(self, emergency_id):
+        return self.ids.get(emergency_id)
+    
+    def by_type(self, emergency_type):
+        return self.tree.search(emergency_type)
+    
+    def by_location(self, location):
+        return self.locations.get(location)
+    
+    def all(self):
+        """All records grouped by type"""
+        return self.tree.inorder()
+    
+    def get_history(self):
+        """All records in resolution order"""
+        return self.history.get_all()
+    
+    def recent(self, count):
+        return self.history.get_last_n(count)
+    
+    def between(self, start=None, end=None):
+        """Records reported in [start, end)"""
+        return self.by_time.range(start, end)
+    
+    def count_by_type(self):
+        return self.tree.count_by_key()
+    
+    def count_by_location(self, since=None):
+        counts = {}
+        for emergency in self.by_time.range(since):
+            counts[emergency["location"]] = counts.get(emergency["location"], 0) + 1
+        return counts
+    
+    def response_summary(self):
+        """avg/min/max/count of resolution_time in minutes"""
+        times = [e["resolution_time"] for e in self.history.get_all() if "resolution_time" in e]
+        if not times:
+            return {"avg": 0, "min": 0, "max": 0, "count": 0}
+        return {"avg": sum(times) / len(times), "min": min(times), "max": max(times), "count": len(times)}
+    
+    def size(self):
+        return self.tree.size()
+    
+    def get_height(self):
+        return self.tree.get_height()
+    
+    def flush(self):
+        pass
+    
+    def close(self):
+        pass
+
+
+class SQLiteHistoryStore:
+    """
+    Resolved history in a SQLite database (WAL journal mode).
+    Inserts are buffered and committed in batched transactions; every
+    query flushes first and pushes its filter, ordering and aggregation
+    down to SQL using indexed columns, unpickling only matching rows.
+    """
+    
+    durable = True  # survives restarts on its own
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS resolved (
+            seq INTEGER PRIMARY KEY,
+            id TEXT UNIQUE NOT NULL,
+            type TEXT NOT NULL,
+            location TEXT NOT NULL,
+            priority INTEGER,
+            timestamp REAL,
+            resolved_at REAL,
+            resolution_time REAL,
+            data BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_resolved_type ON resolved(type, seq);
+        CREATE INDEX IF NOT EXISTS idx_resolved_location ON resolved(location, timestamp);
+        CREATE INDEX IF NOT EXISTS idx_resolved_timestamp ON resolved(timestamp);
+    """
+    
+    # Constant statements so sqlite3 reuses the prepared (cached) form
+    INSERT = (
+        "INSERT OR IGNORE INTO resolved "
+        "(seq, id, type, location, priority, timestamp, resolved_at, resolution_time, data) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    GET = "SELECT data FROM resolved WHERE id = ?"
+    BY_TYPE = "SELECT data FROM resolved WHERE type = ? ORDER BY seq"
+    BY_LOCATION = "SELECT data FROM resolved WHERE location = ? ORDER BY timestamp"
+    ALL = "SELECT data FROM resolved ORDER BY type, seq"
+    HISTORY = "SELECT data FROM resolved ORDER BY seq"
+    RECENT = "SELECT data FROM (SELECT seq, data FROM resolved ORDER BY seq DESC LIMIT ?) ORDER BY seq"
+    BETWEEN = "SELECT data FROM resolved WHERE timestamp >= ? AND timestamp < ? ORDER BY timestamp"
+    COUNT_BY_TYPE = "SELECT type, COUNT(*) FROM resolved GROUP BY type ORDER BY type"
+    COUNT_BY_LOCATION = "SELECT location, COUNT(*) FROM resolved WHERE timestamp >= ? GROUP BY location"
+    RESPONSE = (
+        "SELECT AVG(resolution_time), MIN(resolution_time), MAX(resolution_time), "
+        "COUNT(resolution_time) FROM resolved"
+    )
+    
+    def __init__(self, path, batch_size=100):
+        self.batch_size = batch_size
+        self._pending = []
+        self._lock = threading.RLock()
+        
+        self.conn = sqlite3.connect(path, check_same_thread=False, cached_statements=64)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(self.SCHEMA)
+        self._seq = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM resolved").fetchone()[0]
+        self._load_counts()
+    
+    def _load_counts(self):
+        """Per-type counts and total, kept in memory and updated by add()"""
+        self._type_counts = dict(self.conn.execute(self.COUNT_BY_TYPE).fetchall())
+        self._size = sum(self._type_counts.values())
+    
+    @staticmethod
+    def _epoch(value):
+        return value.timestamp() if isinstance(value, datetime) else value
+    
+    def add(self, emergency):
+        """Buffer a record; a full batch is committed in one transaction"""
+        with self._lock:
+            self._seq += 1
+            self._pending.append((
+                self._seq,
+                emergency["id"],
+                emergency["type"],
+                emergency["location"],
+                emergency.get("priority"),
+                self._epoch(emergency.get("timestamp")),
+                self._epoch(emergency.get("resolved_at")),
+                emergency.get("resolution_time"),
+                pickle.dumps(emergency, protocol=pickle.HIGHEST_PROTOCOL),
+            ))
+            self._type_counts[emergency["type"]] = self._type_counts.get(emergency["type"], 0) + 1
+            self._size += 1
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+    
+    def flush(self):
+        """Commit buffered inserts"""
+        with self._lock:
+            if not self._pending:
+                return
+            before = self.conn.total_changes
+            with self.conn:
+                self.conn.executemany(self.INSERT, self._pending)
+            if self.conn.total_changes - before != len(self._pending):
+                self._load_counts()  # ignored duplicates (replayed resolves) were counted
+            self._pending.clear()
+    
+    def _query(self, sql, params=()):
+        with self._lock:
+            self.flush()
+            return self.conn.execute(sql, params).fetchall()
+    
+    def _records(self, sql, params=()):
+        return [pickle.loads(row[0]) for row in self._query(sql, params)]
+    
+    def get(self, emergency_id):
+        rows = self._query(self.GET, (emergency_id,))
+        return pickle.loads(rows[0][0]) if rows else None
+    
+    def by_type(self, emergency_type):
+        return self._records(self.BY_TYPE, (emergency_type,))
+    
+    def by_location(self, location):
+        return self._records(self.BY_LOCATION, (location,))
+    
+    def all(self):
+        return self._records(self.ALL)
+    
+    def get_history(self):
+        return self._records(self.HISTORY)
+    
+    def recent(self, count):
+        return self._records(self.RECENT, (count,))
+    
+    def between(self, start=None, end=None):
+        start = float("-inf") if start is None else self._epoch(start)
+        end = float("inf") if end is None else self._epoch(end)
+        return self._records(self.BETWEEN, (start, end))
+    
+    def count_by_type(self):
+        with self._lock:
+            return dict(sorted(self._type_counts.items()))
+    
+    def count_by_location(self, since=None):
+        since = float("-inf") if since is None else self._epoch(since)
+        return dict(self._query(self.COUNT_BY_LOCATION, (since,)))
+    
+    def response_summary(self):
+        avg, low, high, count = self._query(self.RESPONSE)[0]
+        if not count:
+            return {"avg": 0, "min": 0, "max": 0, "count": 0}
+        return {"avg": avg, "min": low, "max": high, "count": count}
+    
+    def size(self):
+        return self._size
+    
+    def get_height(self):
+        return 0  # B-tree depth is internal to SQLite
+    
+    def close(self):
+        with self._lock:
+            self.flush()
+            self.conn.close()
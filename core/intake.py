@@ -0,0 +1,115 @@
+# core/intake.py - Asyncio intake pipeline with micro-batched commits
+
+import asyncio
+import time
+from collections import deque
+from config import INTAKE_QUEUE_SIZE, INTAKE_BATCH_SIZE, INTAKE_BATCH_MS
+
+class IntakePipeline:
+    """
+    Asyncio front end for EmergencyManager.report_batch().
+    Producers await submit(), which blocks while the bounded queue is
+    full (backpressure). A single consumer task drains up to batch_size
+    reports, lingering at most batch_ms while producers keep adding, then
+    commits them in one batch, so the manager only ever has one writer.
+    """
+    
+    def __init__(self, manager, max_queue=INTAKE_QUEUE_SIZE,
+                 batch_size=INTAKE_BATCH_SIZE, batch_ms=INTAKE_BATCH_MS):
+        self.manager = manager
+        self.batch_size = batch_size
+        self.batch_wait = batch_ms / 1000
+        self.queue = asyncio.Queue(maxsize=max_queue)
+        self._consumer = None
+        
+        # Metrics
+        self.max_depth = 0
+        self.batch_sizes = {}  # batch size -> number of batches
+        self.latencies = deque(maxlen=10000)  # seconds, submit -> committed
+        self.committed = 0
+    
+    async def start(self):
+        if self._consumer is None:
+            self._consumer = asyncio.create_task(self._run())
+    
+    async def stop(self):
+        """Commit everything queued, then stop the consumer"""
+        if self._consumer is None:
+            return
+        await self.queue.join()
+        self._consumer.cancel()
+        try:
+            await self._consumer
+        except asyncio.CancelledError:
+            pass
+        self._consumer = None
+    
+    async def submit(self, emergency_data):
+        """Queue a report and wait until it is committed - returns its ID"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((emergency_data, time.perf_counter(), future))
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+        return await future
+    
+    async def _next_batch(self):
+        """
+        Up to batch_size items: block for the first, then keep taking while
+        producers are still adding, for at most batch_ms
+        """
+        batch = [await self.queue.get()]
+        deadline = time.perf_counter() + self.batch_wait
+        
+        while len(batch) < self.batch_size and time.perf_counter() < deadline:
+            if self.queue.empty():
+                # Let ready producers run; stop lingering once none add more
+                await asyncio.sleep(0)
+                if self.queue.empty():
+                    break
+            batch.append(self.queue.get_nowait())
+        return batch
+    
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                results = self.manager.report_batch([item[0] for item in batch])
+            except Exception as exc:
+                results = [exc] * len(batch)
+            
+            now = time.perf_counter()
+            for (_, submitted, future), result in zip(batch, results):
+                if not future.done():
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+                self.latencies.append(now - submitted)
+                self.queue.task_done()
+            
+            self.committed += len(batch)
+            self.batch_sizes[len(batch)] = self.batch_sizes.get(len(batch), 0) + 1
+    
+    def get_metrics(self):
+        """Queue depth, batch size distribution and latency percentiles (ms)"""
+        latencies = sorted(self.latencies)
+        
+        def percentile(p):
+            if not latencies:
+                return 0
+            return latencies[min(len(latencies) - 1, int(p / 100 * len(latencies)))] * 1000
+        
+        batches = sum(self.batch_sizes.values())
+        return {
+            "queue_depth": self.queue.qsize(),
+            "max_queue_depth": self.max_depth,
+            "committed": self.committed,
+            "batches": batches,
+            "avg_batch_size": self.committed / batches if batches else 0,
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            "latency_ms": {
+                "p50": percentile(50),
+                "p95": percentile(95),
+                "p99": percentile(99),
+                "max": latencies[-1] * 1000 if latencies else 0,
+            },
+        }
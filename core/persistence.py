@@ -0,0 +1,234 @@
+# core/persistence.py - Write-ahead log and snapshots for crash recovery
+
+import glob
+import os
+import pickle
+import struct
+import threading
+import zlib
+
+# Record framing: payload length, CRC32 of payload, log sequence number
+HEADER = struct.Struct("<IIQ")
+
+class WriteAheadLog:
+    """
+    Append-only binary log with group commit and compact snapshots.
+    append() only buffers in memory; a background flusher writes and
+    fsyncs whole batches, so logging costs microseconds per event.
+    Snapshots roll the log to a new segment; recovery loads the latest
+    snapshot and replays only records written after it. Resolved history
+    is appended to history.log in increments at each snapshot, so a
+    snapshot only carries the (bounded) active state.
+    """
+    
+    def __init__(self, directory, flush_interval=0.05, batch_size=256):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        os.makedirs(directory, exist_ok=True)
+        
+        self.lsn = 0  # last assigned sequence number
+        self.durable_lsn = 0  # last sequence number known to be on disk
+        self.stats = {"records": 0, "batches": 0, "fsyncs": 0, "snapshots": 0}
+        
+        self._buffer = []
+        self._lock = threading.Lock()  # buffer, LSNs and stats
+        self._io_lock = threading.Lock()  # file writes, held without _lock
+        self._wake = threading.Condition(self._lock)
+        self._durable = threading.Condition(self._lock)
+        self._file = None
+        self._closed = False
+        self._flusher = None
+    
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+    
+    def recover(self):
+        """
+        Read the latest snapshot, the history it covers and the log
+        records written after it. Must be called once before the first append.
+        Returns: (snapshot state or None, list of history items, list of records)
+        """
+        state, snapshot_lsn = None, 0
+        snapshots = self._list("snapshot-*.pkl")
+        if snapshots:
+            snapshot_lsn, path = snapshots[-1]
+            with open(path, "rb") as f:
+                state = pickle.load(f)
+        
+        # History batches are tagged with their snapshot's LSN; a batch
+        # whose snapshot never landed is still covered by the WAL
+        history = []
+        history_path = os.path.join(self.directory, "history.log")
+        if os.path.exists(history_path):
+            for lsn, batch in self._read_segment(history_path):
+                if lsn <= snapshot_lsn:
+                    history.extend(batch)
+        
+        records = []
+        last_lsn = snapshot_lsn
+        for start_lsn, path in self._list("wal-*.log"):
+            for lsn, record in self._read_segment(path):
+                if lsn > snapshot_lsn:
+                    records.append(record)
+                    last_lsn = max(last_lsn, lsn)
+        
+        self.lsn = self.durable_lsn = last_lsn
+        self._open_segment(last_lsn + 1)
+        return state, history, records
+    
+    def _list(self, pattern):
+        """Files matching pattern sorted by the sequence number in their name"""
+        found = []
+        for path in glob.glob(os.path.join(self.directory, pattern)):
+            name = os.path.basename(path)
+            try:
+                found.append((int(name.split("-")[1].split(".")[0]), path))
+            except (IndexError, ValueError):
+                continue
+        return sorted(found)
+    
+    def _read_segment(self, path):
+        """Yield (lsn, record) until the end or the first torn/corrupt record"""
+        with open(path, "rb") as f:
+            data = f.read()
+        
+        offset = 0
+        while offset + HEADER.size <= len(data):
+            length, crc, lsn = HEADER.unpack_from(data, offset)
+            payload = data[offset + HEADER.size:offset + HEADER.size + length]
+            if len(payload) < length or zlib.crc32(payload) != crc:
+                break  # torn write at the tail of a crashed run
+            yield lsn, pickle.loads(payload)
+            offset += HEADER.size + length
+    
+    def _open_segment(self, start_lsn):
+        path = os.path.join(self.directory, f"wal-{start_lsn:020d}.log")
+        self._file = open(path, "ab")
+        self.segment_start = start_lsn
+    
+    # ------------------------------------------------------------------
+    # Logging
+    # ------------------------------------------------------------------
+    
+    def append(self, record):
+        """Buffer a record for the next group commit - returns its LSN"""
+        payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+        
+        with self._lock:
+            self.lsn += 1
+            self._buffer.append(HEADER.pack(len(payload), zlib.crc32(payload), self.lsn) + payload)
+            self.stats["records"] += 1
+            
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+                self._flusher.start()
+            if len(self._buffer) >= self.batch_size:
+                self._wake.notify()
+            return self.lsn
+    
+    def _flush_loop(self):
+        while True:
+            with self._lock:
+                if self._closed:
+                    return
+                self._wake.wait(self.flush_interval)
+            self._flush()
+    
+    def _flush(self):
+        """
+        Write and fsync everything buffered as one batch. The buffer is
+        swapped out under the lock; the disk I/O runs without it, so
+        append() never waits for an fsync.
+        """
+        with self._io_lock:
+            self._write_batch()
+    
+    def _write_batch(self):
+        """Body of _flush (_io_lock held)"""
+        with self._lock:
+            if not self._buffer:
+                return
+            batch, self._buffer = self._buffer, []
+            lsn = self.lsn
+        
+        self._file.write(b"".join(batch))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        
+        with self._lock:
+            self.durable_lsn = lsn
+            self.stats["batches"] += 1
+            self.stats["fsyncs"] += 1
+            self._durable.notify_all()
+    
+    def sync(self):
+        """Force the current batch to disk"""
+        self._flush()
+    
+    def wait_durable(self, lsn, timeout=None):
+        """Block until lsn is on disk (for callers that need it)"""
+        with self._lock:
+            if self.durable_lsn < lsn:
+                self._wake.notify()
+                self._durable.wait_for(lambda: self.durable_lsn >= lsn, timeout)
+            return self.durable_lsn >= lsn
+    
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+    
+    def snapshot(self, state, history=()):
+        """
+        Atomically write a snapshot covering every record so far, roll to a
+        new log segment and delete the segments/snapshots it supersedes.
+        history: items to add to history.log (those new since the last snapshot)
+        """
+        with self._io_lock:
+            self._write_batch()
+            with self._lock:
+                lsn = self.lsn
+            
+            if history:
+                payload = pickle.dumps(list(history), protocol=pickle.HIGHEST_PROTOCOL)
+                with open(os.path.join(self.directory, "history.log"), "ab") as f:
+                    f.write(HEADER.pack(len(payload), zlib.crc32(payload), lsn) + payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+            
+            path = os.path.join(self.directory, f"snapshot-{lsn:020d}.pkl")
+            tmp = path + ".tmp"
+            with open(tmp, "wb") as f:
+                pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, path)
+            
+            # Records appended meanwhile are still buffered: they go to the new segment
+            self._file.close()
+            self._open_segment(lsn + 1)
+            
+            for start_lsn, old in self._list("wal-*.log"):
+                if start_lsn <= lsn:
+                    os.remove(old)
+            for snapshot_lsn, old in self._list("snapshot-*.pkl"):
+                if snapshot_lsn < lsn:
+                    os.remove(old)
+            
+            with self._lock:
+                self.stats["snapshots"] += 1
+            return lsn
+    
+    def close(self):
+        """Flush outstanding records and stop the flusher"""
+        with self._io_lock:
+            self._write_batch()
+            with self._lock:
+                self._closed = True
+                self._wake.notify_all()
+            if self._file:
+                self._file.close()
+        
+        if self._flusher is not None:
+            self._flusher.join()
@@ -0,0 +1,208 @@
+# core/records.py - Compact emergency records
+
+import sys
+from datetime import datetime
+from config import EMERGENCY_TYPES
+
+class Codebook:
+    """Interns repeated strings as small integer codes"""
+    
+    def __init__(self, names=()):
+        self.names = []
+        self.codes = {}
+        for name in names:
+            self.encode(name)
+    
+    def encode(self, name):
+        code = self.codes.get(name)
+        if code is None:
+            code = len(self.names)
+            self.names.append(sys.intern(name))
+            self.codes[self.names[code]] = code
+        return code
+    
+    def decode(self, code):
+        return self.names[code]
+
+
+TYPES = Codebook(EMERGENCY_TYPES)
+SEVERITIES = Codebook(["Low", "Medium", "High", "Critical"])
+STATUSES = Codebook(["active", "spooled", "resolved"])
+
+# Fields stored as codebook codes and as epoch-second integers
+CODED = {"type": TYPES, "severity": SEVERITIES, "status": STATUSES}
+EPOCH = ("timestamp", "resolved_at")
+
+FIELDS = (
+    "id", "type", "location", "description", "priority", "timestamp", "status",
+    "assigned_resources", "severity", "affected_people", "estimated_response_time",
+    "resolved_at", "resolution_time",
+)
+
+
+class EmergencyRecord:
+    """
+    Slotted emergency record with a dict-compatible interface.
+    Type, severity and status are codebook codes, timestamps are epoch
+    seconds and location/description strings are interned, so an
+    incident costs one small object instead of a dict plus a datetime.
+    Reads through record["key"] / record.get("key") return the same
+    values the dict form did; unknown keys go to a small overflow dict.
+    A field that was never set behaves like a missing dict key.
+    """
+    
+    __slots__ = FIELDS + ("extra",)
+    
+    def __init__(self, data=None, **fields):
+        if data:
+            self.update(data)
+        if fields:
+            self.update(fields)
+    
+    @classmethod
+    def from_dict(cls, data):
+        return data if isinstance(data, cls) else cls(data)
+    
+    def to_dict(self):
+        return dict(self.items())
+    
+    # ------------------------------------------------------------------
+    # Mapping interface
+    # ------------------------------------------------------------------
+    
+    def __getitem__(self, key):
+        if key in CODED:
+            try:
+                return CODED[key].decode(object.__getattribute__(self, key))
+            except AttributeError:
+                raise KeyError(key) from None
+        if key in EPOCH:
+            try:
+                value = object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+            return None if value is None else datetime.fromtimestamp(value)
+        if key in FIELDS:
+            try:
+                return object.__getattribute__(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        
+        extra = getattr(self, "extra", None)
+        if extra is None or key not in extra:
+            raise KeyError(key)
+        return extra[key]
+    
+    def __setitem__(self, key, value):
+        if key in CODED:
+            object.__setattr__(self, key, CODED[key].encode(value))
+        elif key in EPOCH:
+            if isinstance(value, datetime):
+                value = int(value.timestamp())
+            object.__setattr__(self, key, value)
+        elif key in FIELDS:
+            if key in ("location", "description") and isinstance(value, str):
+                value = sys.intern(value)
+            object.__setattr__(self, key, value)
+        else:
+            extra = getattr(self, "extra", None)
+            if extra is None:
+                extra = self.extra = {}
+            extra[key] = value
+    
+    def __delitem__(self, key):
+        if key in FIELDS:
+            try:
+                object.__delattr__(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        else:
+            extra = getattr(self, "extra", None)
+            if extra is None or key not in extra:
+                raise KeyError(key)
+            del extra[key]
+    
+    def __contains__(self, key):
+        if key in FIELDS:
+            return hasattr(self, key)
+        extra = getattr(self, "extra", None)
+        return extra is not None and key in extra
+    
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+    
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+    
+    def pop(self, key, *default):
+        try:
+            value = self[key]
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        del self[key]
+        return value
+    
+    def update(self, other=(), **fields):
+        items = other.items() if hasattr(other, "items") else other
+        for key, value in items:
+            self[key] = value
+        for key, value in fields.items():
+            self[key] = value
+    
+    def keys(self):
+        keys = [field for field in FIELDS if hasattr(self, field)]
+        if getattr(self, "extra", None):
+            keys.extend(self.extra)
+        return keys
+    
+    def values(self):
+        return [self[key] for key in self.keys()]
+    
+    def items(self):
+        return [(key, self[key]) for key in self.keys()]
+    
+    def __iter__(self):
+        return iter(self.keys())
+    
+    def __len__(self):
+        return len(self.keys())
+    
+    def __eq__(self, other):
+        if isinstance(other, (EmergencyRecord, dict)):
+            return self.to_dict() == dict(other.items())
+        return NotImplemented
+    
+    __hash__ = None  # mutable and compared by content, like dict
+    
+    def __reduce__(self):
+        # Raw slot values, except codes: codebooks are process-local
+        state = {}
+        for field in FIELDS:
+            value = getattr(self, field, _MISSING)
+            if value is not _MISSING:
+                state[field] = CODED[field].decode(value) if field in CODED else value
+        return (_restore, (state, getattr(self, "extra", None)))
+    
+    def __repr__(self):
+        return f"EmergencyRecord({self.to_dict()!r})"
+
+
+_MISSING = object()
+
+def _restore(state, extra):
+    """Unpickle an EmergencyRecord from EmergencyRecord.__reduce__ state"""
+    record = EmergencyRecord()
+    for field, value in state.items():
+        if field in CODED:
+            value = CODED[field].encode(value)
+        object.__setattr__(record, field, value)
+    if extra:
+        record.extra = extra
+    return record
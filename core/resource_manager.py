@@ -1,15 +1,26 @@
 # core/resource_manager.py - Resource and Route Management
 
-from data_structures import Graph, HashTable
+from data_structures import Graph, HashTable, SpatialGrid, GraphVoronoi, CircularQueue
 from utils.data_generator import data_generator
+from utils.assignment import hungarian
+from utils.helpers import get_coordinates, project_to_km
+from core.change_feed import ChangeFeed
+from config import (
+    RESOURCE_TYPES, SPATIAL_CELL_SIZE, SPATIAL_MIN_AIR_RATIO, PREEMPTION_PRIORITY,
+    PREEMPTION_MAX_DISTANCE, ALLOCATION_MAX_UNITS
+)
+from collections import deque
+from datetime import datetime
+import heapq
 import random
+import threading
 
 class ResourceManager:
     """
     Manage emergency response resources and routing
     """
     
-    def __init__(self):
+    def __init__(self, change_feed=None, on_assignment=None):
         # Route graph
         self.route_graph = Graph()
         
@@ -17,8 +28,66 @@ class ResourceManager:
         self.resources = HashTable(size=50)
         self.resources_by_type = {}
         
+        # Availability indexes (type/location -> {resource_id: resource})
+        self.available_by_type = {}
+        self.available_by_location = {}
+        
+        # Counters maintained on every status change (for O(1) stats)
+        self.status_counts = {"available": 0, "deployed": 0, "maintenance": 0}
+        self.type_counts = {}  # type -> {"total": n, "available": n}
+        
+        # Spatial index of available units (type -> SpatialGrid)
+        self.spatial_index = {}
+        self.unplaced_by_type = {}  # available units with unknown coordinates
+        self._positions = {}  # location -> planar (x, y) km or None
+        self.node_index = SpatialGrid(SPATIAL_CELL_SIZE)  # routable nodes, for snapping pings
+        
+        # Least-recently-used rotation per depot: (location, type) ->
+        # CircularQueue of (resource_id, token); stale tokens are skipped
+        self.rotation = {}
+        self._rotation_tokens = {}  # resource_id -> token of its live entry
+        self._rotation_counter = 0
+        
+        # Nearest available unit per node (type -> GraphVoronoi). Index
+        # changes only queue label updates; they are repaired outside
+        # _index_lock by one thread at a time, and readers don't lock
+        self.voronoi = {}
+        self._label_ops = deque()
+        self._label_lock = threading.Lock()
+        
+        # Lower bound on network distance / air distance over all edges.
+        # Pruning by air distance only works when edge weights track
+        # geography; below SPATIAL_MIN_AIR_RATIO the grids are dropped
+        self._air_ratio = float('inf')
+        
         # Assignment tracking
-        self.assignments = {}  # emergency_id -> [resource_ids]
+        self.assignments = {}  # emergency_id -> {resource_ids}
+        self.assigned_to = {}  # resource_id -> emergency_id (reverse index)
+        self.deployed_for = {}  # resource_id -> emergency dict, when known
+        self.deployed_index = {}  # type -> {location: {resource_id: priority}}
+        
+        # Optimistic concurrency: per-resource versions guarded by striped
+        # locks; shared indexes/counters use a short bookkeeping lock
+        self._stripes = [threading.Lock() for _ in range(64)]
+        self._index_lock = threading.RLock()
+        self.dispatch_stats = {"attempts": 0, "conflicts": 0, "assigned": 0}
+        
+        # Unmet demand waiting for a unit (type -> heap of
+        # (priority, timestamp, seq, emergency_id)); entries are valid
+        # only while present in _waiting (lazy deletion)
+        self.waiting_demand = {}
+        self._waiting = {}  # emergency_id -> {resource_type: emergency}
+        self._demand_counter = 0
+        self.recent_matches = deque(maxlen=100)
+        
+        # Typed deltas for subscribers (may be shared with EmergencyManager)
+        self.changes = change_feed if change_feed is not None else ChangeFeed()
+        self._priority_deltas = self.changes.subscribe()  # "reprioritised" -> deployed_index
+        
+        # Called as on_assignment(emergency_id, resource_ids) when a unit is
+        # matched or preempted outside a dispatch call, so the owner of the
+        # incident can record (and WAL-log) it - e.g. EmergencyManager.record_assignment
+        self.on_assignment = on_assignment
         
         self.resource_counter = 0
         
@@ -35,6 +104,43 @@ class ResourceManager:
                 edge["to"],
                 edge["distance"]
             )
+            self._note_edge(edge["from"], edge["to"], edge["distance"])
+    
+    def _position(self, location):
+        """Planar position of a location (cached), None if unknown"""
+        if location not in self._positions:
+            coordinates = get_coordinates(location)
+            self._positions[location] = project_to_km(*coordinates) if coordinates else None
+        return self._positions[location]
+    
+    def _air_distance(self, a, b):
+        """Straight-line distance between two known positions"""
+        return ((a[0] - b[0]) ** 2 + (a[1] - b[1]) ** 2) ** 0.5
+    
+    def _note_edge(self, u, v, weight):
+        """
+        Tighten the network/air distance ratio for a new edge.
+        By the triangle inequality, any route is at least ratio * air distance.
+        An edge touching an unknown location voids the bound (ratio 0).
+        """
+        pos_u, pos_v = self._position(u), self._position(v)
+        for node, pos in ((u, pos_u), (v, pos_v)):
+            if pos is not None and not self.node_index.contains(node):
+                self.node_index.insert(node, *pos)
+        
+        if pos_u is None or pos_v is None:
+            self._air_ratio = 0
+        else:
+            air = self._air_distance(pos_u, pos_v)
+            if air > 0:
+                self._air_ratio = min(self._air_ratio, float(weight) / air)
+        
+        if not self._can_prune():
+            self.spatial_index.clear()  # the ratio never rises again
+    
+    def _can_prune(self):
+        """True if the air-distance bound is tight enough to skip candidates"""
+        return self._air_ratio >= SPATIAL_MIN_AIR_RATIO
     
     def add_resource(self, resource_type, location, capacity=None):
         """
@@ -48,9 +154,10 @@ class ResourceManager:
             "id": resource_id,
             "type": resource_type,
             "location": location,
-            "status": "available",
-            "capacity": capacity or 5,
-            "assigned_to": None
+            "status": None,
+            "capacity": capacity or RESOURCE_TYPES.get(resource_type, {}).get("capacity", 5),
+            "assigned_to": None,
+            "version": 0
         }
         
         # Add to hash table
@@ -61,9 +168,20 @@ class ResourceManager:
             self.resources_by_type[resource_type] = []
         self.resources_by_type[resource_type].append(resource)
         
+        # Count and index as available
+        if resource_type not in self.type_counts:
+            self.type_counts[resource_type] = {"total": 0, "available": 0}
+        with self._index_lock:
+            self.type_counts[resource_type]["total"] += 1
+            self._set_status(resource, "available")
+        self._repair_labels()
+        
         # Ensure location is in graph
         self.route_graph.add_node(location)
         
+        # A new unit can serve waiting demand straight away
+        self._match_waiting_demand(resource)
+        
         return resource_id
     
     def get_resource(self, resource_id):
@@ -76,67 +194,644 @@ class ResourceManager:
     
     def get_available_resources(self, resource_type=None):
         """Get available resources, optionally filtered by type"""
-        all_resources = self.resources.values()
-        available = [r for r in all_resources if r["status"] == "available"]
-        
         if resource_type:
-            available = [r for r in available if r["type"] == resource_type]
+            return list(self.available_by_type.get(resource_type, {}).values())
         
+        available = []
+        for units in self.available_by_type.values():
+            available.extend(units.values())
         return available
     
-    def assign_resource(self, resource_id, emergency_id):
-        """Assign a resource to an emergency"""
+    def get_available_at_location(self, location, resource_type=None):
+        """Get available resources stationed at a location"""
+        units = self.available_by_location.get(location, {}).values()
+        if resource_type:
+            return [r for r in units if r["type"] == resource_type]
+        return list(units)
+    
+    def _set_status(self, resource, status):
+        """Change resource status, keeping counters and indexes in sync - O(1)"""
+        old_status = resource["status"]
+        if old_status == status:
+            return
+        
+        if old_status is not None:
+            self.status_counts[old_status] = self.status_counts.get(old_status, 0) - 1
+        self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        resource["status"] = status
+        
+        if old_status == "available":
+            self.type_counts[resource["type"]]["available"] -= 1
+            self._unindex_available(resource)
+        elif status == "available":
+            self.type_counts[resource["type"]]["available"] += 1
+            self._index_available(resource)
+    
+    def _index_available(self, resource):
+        """Add resource to the availability indexes - O(1)"""
+        self.available_by_type.setdefault(resource["type"], {})[resource["id"]] = resource
+        self.available_by_location.setdefault(resource["location"], {})[resource["id"]] = resource
+        
+        self._enqueue_rotation(resource)
+        
+        self._label_ops.append(("add", resource["type"], resource["id"], resource["location"]))
+        
+        position = self._position(resource["location"])
+        if position is None:
+            self.unplaced_by_type.setdefault(resource["type"], {})[resource["id"]] = resource
+        elif self._can_prune():
+            if resource["type"] not in self.spatial_index:
+                self.spatial_index[resource["type"]] = SpatialGrid(SPATIAL_CELL_SIZE)
+            self.spatial_index[resource["type"]].insert(resource["id"], *position)
+    
+    def _enqueue_rotation(self, resource):
+        """Put a newly available unit at the back of its depot rotation - O(1)"""
+        key = (resource["location"], resource["type"])
+        queue = self.rotation.get(key)
+        if queue is None:
+            queue = self.rotation[key] = CircularQueue(capacity=4, growable=True)
+        
+        self._rotation_counter += 1
+        self._rotation_tokens[resource["id"]] = self._rotation_counter
+        queue.enqueue((resource["id"], self._rotation_counter))
+        
+        # Compact once stale entries dominate (amortised O(1))
+        live = len(self.available_by_location.get(resource["location"], ()))
+        if queue.size > 2 * live + 8:
+            entries = [e for e in queue.get_all() if self._rotation_tokens.get(e[0]) == e[1]]
+            queue.clear()
+            for entry in entries:
+                queue.enqueue(entry)
+    
+    def _rotation_pick(self, resource):
+        """
+        Least-recently-used available unit of the same type at the same
+        location as resource (all equally near) - amortised O(1)
+        """
+        with self._index_lock:
+            queue = self.rotation.get((resource["location"], resource["type"]))
+            while queue is not None and not queue.is_empty():
+                resource_id, token = queue.peek()
+                candidate = self.available_by_location.get(resource["location"], {}).get(resource_id)
+                if candidate is not None and self._rotation_tokens.get(resource_id) == token:
+                    return candidate
+                queue.dequeue()  # deployed or moved since it was queued
+            return resource
+    
+    def _rotation_order(self, location, resource_type):
+        """Available units of a type at a depot, least recently used first"""
+        with self._index_lock:
+            units = {
+                r["id"]: r for r in self.get_available_at_location(location, resource_type)
+            }
+            queue = self.rotation.get((location, resource_type))
+            ordered = []
+            for resource_id, token in queue.get_all() if queue is not None else ():
+                if resource_id in units and self._rotation_tokens.get(resource_id) == token:
+                    ordered.append(units.pop(resource_id))
+            return ordered + list(units.values())
+    
+    def _unindex_available(self, resource):
+        """Remove resource from the availability indexes - O(1)"""
+        units = self.available_by_type.get(resource["type"])
+        if units is not None:
+            units.pop(resource["id"], None)
+        
+        units = self.available_by_location.get(resource["location"])
+        if units is not None:
+            units.pop(resource["id"], None)
+            if not units:
+                del self.available_by_location[resource["location"]]
+        
+        self._label_ops.append(("remove", resource["type"], resource["id"], None))
+        
+        grid = self.spatial_index.get(resource["type"])
+        if grid is not None:
+            grid.remove(resource["id"])
+        
+        units = self.unplaced_by_type.get(resource["type"])
+        if units is not None:
+            units.pop(resource["id"], None)
+        
+        self._rotation_tokens.pop(resource["id"], None)
+    
+    def _compare_and_set(self, resource, expected_version, status, emergency_id, emergency=None):
+        """
+        Versioned compare-and-set of a resource's status and assignment.
+        Fails if any other writer changed the resource since expected_version.
+        """
+        if not self._compare_and_set_locked(resource, expected_version, status, emergency_id, emergency):
+            return False
+        self._repair_labels()
+        return True
+    
+    def _compare_and_set_locked(self, resource, expected_version, status, emergency_id, emergency):
+        """Body of _compare_and_set (takes the resource's stripe lock)"""
+        lock = self._stripes[hash(resource["id"]) % len(self._stripes)]
+        with lock:
+            if resource["version"] != expected_version:
+                return False
+            resource["version"] = expected_version + 1
+            previous = resource["assigned_to"]
+            
+            with self._index_lock:
+                self._set_status(resource, status)
+                self._track_assignment(resource, emergency_id, emergency)
+            
+            # Published under the stripe lock so per-unit deltas stay in order
+            if emergency_id is not None:
+                self.changes.publish("assigned", ("resource", resource["id"]), {
+                    "status": status,
+                    "assigned_to": emergency_id,
+                    "previous": previous,
+                    "location": resource["location"]
+                })
+            elif previous is not None:
+                self.changes.publish("released", ("resource", resource["id"]), {
+                    "status": status,
+                    "assigned_to": None,
+                    "previous": previous,
+                    "location": resource["location"]
+                })
+            return True
+    
+    def _track_assignment(self, resource, emergency_id, emergency=None):
+        """Move a resource between assignment sets, dropping empty ones"""
+        resource_id = resource["id"]
+        
+        old_emergency = self.assigned_to.pop(resource_id, None)
+        assigned = self.assignments.get(old_emergency)
+        if assigned is not None:
+            assigned.discard(resource_id)
+            if not assigned:
+                del self.assignments[old_emergency]
+        
+        if self.deployed_for.pop(resource_id, None) is not None:
+            self._unindex_deployed(resource)
+        
+        if emergency_id is not None:
+            if emergency_id not in self.assignments:
+                self.assignments[emergency_id] = set()
+            self.assignments[emergency_id].add(resource_id)
+            self.assigned_to[resource_id] = emergency_id
+            
+            # Preemption index needs the assignment's priority
+            if emergency is not None:
+                self.deployed_for[resource_id] = emergency
+                self._index_deployed(resource, emergency.get("priority", 5))
+        
+        resource["assigned_to"] = emergency_id
+    
+    def _repair_labels(self):
+        """
+        Apply queued Voronoi label updates, in order, outside _index_lock.
+        If another thread is already repairing it applies ours too: it
+        re-checks the queue after releasing the lock.
+        """
+        while self._label_ops:
+            if not self._label_lock.acquire(blocking=False):
+                return
+            try:
+                while self._label_ops:
+                    op, resource_type, a, b = self._label_ops.popleft()
+                    if op == "add":
+                        if resource_type not in self.voronoi:
+                            self.voronoi[resource_type] = GraphVoronoi(self.route_graph)
+                        self.voronoi[resource_type].add_source(a, b)
+                    elif op == "remove":
+                        voronoi = self.voronoi.get(resource_type)
+                        if voronoi is not None:
+                            voronoi.remove_source(a)
+                    else:  # route (a, b) changed from weight old to new
+                        old_weight, weight = resource_type
+                        for voronoi in list(self.voronoi.values()):
+                            if old_weight is not None and weight > old_weight:
+                                voronoi.rebuild()  # a longer edge can only be repaired globally
+                            else:
+                                voronoi.relax_edge(a, b, weight)
+            finally:
+                self._label_lock.release()
+    
+    def _index_deployed(self, resource, priority):
+        by_location = self.deployed_index.setdefault(resource["type"], {})
+        by_location.setdefault(resource["location"], {})[resource["id"]] = priority
+    
+    def _unindex_deployed(self, resource):
+        by_location = self.deployed_index.get(resource["type"], {})
+        units = by_location.get(resource["location"])
+        if units is not None:
+            units.pop(resource["id"], None)
+            if not units:
+                del by_location[resource["location"]]
+    
+    def _sync_priorities(self):
+        """Re-index deployed units whose incident was reprioritised (change feed)"""
+        with self._index_lock:
+            deltas = self._priority_deltas.poll()
+            if deltas is None:
+                # Fell behind the feed: re-read every deployed incident
+                changed = set(self.assignments)
+            else:
+                changed = {
+                    d.key[1] for d in deltas
+                    if d.kind == "reprioritised" and d.key[0] == "emergency"
+                }
+            
+            for emergency_id in changed:
+                for resource_id in self.assignments.get(emergency_id, ()):
+                    emergency = self.deployed_for.get(resource_id)
+                    if emergency is not None:
+                        self._index_deployed(self.resources.get(resource_id), emergency.get("priority", 5))
+    
+    def assign_resource(self, resource_id, emergency_id, emergency=None):
+        """
+        Assign a resource to an emergency (fails if another dispatcher won).
+        Pass the emergency dict to make the unit a preemption candidate.
+        """
         resource = self.resources.get(resource_id)
         if not resource:
             return False
         
+        version = resource["version"]
         if resource["status"] != "available":
             return False
         
-        resource["status"] = "deployed"
-        resource["assigned_to"] = emergency_id
+        return self._compare_and_set(resource, version, "deployed", emergency_id, emergency)
+    
+    def release_resource(self, resource_id, emergency_id=None):
+        """
+        Release a resource back to available pool.
+        If emergency_id is given, only release while still assigned to it.
+        """
+        resource = self.resources.get(resource_id)
+        if not resource:
+            return False
         
-        # Track assignment
-        if emergency_id not in self.assignments:
-            self.assignments[emergency_id] = []
-        self.assignments[emergency_id].append(resource_id)
+        while True:
+            version = resource["version"]
+            if emergency_id is not None and resource["assigned_to"] != emergency_id:
+                return False
+            if self._compare_and_set(resource, version, "available", None):
+                break
         
+        self._match_waiting_demand(resource)
         return True
     
-    def release_resource(self, resource_id):
-        """Release a resource back to available pool"""
+    def release_all(self, emergency_id):
+        """
+        Release every resource assigned to an emergency and drop any
+        demand it still has waiting
+        Returns: list of released resource IDs
+        """
+        self.cancel_demand(emergency_id)
+        
+        released = []
+        for resource_id in self.get_assigned_resources(emergency_id):
+            if self.release_resource(resource_id, emergency_id):
+                released.append(resource_id)
+        return released
+    
+    def enqueue_demand(self, emergency, resource_type):
+        """Queue an unmet need until a unit of resource_type is released - O(log n)"""
+        with self._index_lock:
+            waiting = self._waiting.setdefault(emergency["id"], {})
+            if resource_type in waiting:
+                return
+            waiting[resource_type] = emergency
+            
+            self._demand_counter += 1
+            entry = (
+                emergency.get("priority", 5),
+                emergency.get("timestamp") or datetime.now(),
+                self._demand_counter,
+                emergency["id"]
+            )
+            heapq.heappush(self.waiting_demand.setdefault(resource_type, []), entry)
+    
+    def cancel_demand(self, emergency_id):
+        """Drop all waiting demand of an emergency - O(1), heap entries go stale"""
+        with self._index_lock:
+            self._waiting.pop(emergency_id, None)
+    
+    def get_waiting_demand(self):
+        """Get count of waiting emergencies per resource type"""
+        with self._index_lock:
+            counts = {}
+            for waiting in self._waiting.values():
+                for resource_type in waiting:
+                    counts[resource_type] = counts.get(resource_type, 0) + 1
+            return counts
+    
+    def _pop_demand(self, resource_type):
+        """Pop the best valid waiting demand for a type, skipping stale entries"""
+        heap = self.waiting_demand.get(resource_type)
+        while heap:
+            entry = heapq.heappop(heap)
+            waiting = self._waiting.get(entry[3])
+            if waiting is None or resource_type not in waiting:
+                continue
+            
+            emergency = waiting.pop(resource_type)
+            if not waiting:
+                del self._waiting[entry[3]]
+            return entry, emergency
+        return None, None
+    
+    def _match_waiting_demand(self, resource):
+        """Hand a freed unit to the best waiting emergency, routed from where the unit is"""
+        with self._index_lock:
+            entry, emergency = self._pop_demand(resource["type"])
+        if emergency is None:
+            return None
+        
+        distance, path = self.route_graph.dijkstra(resource["location"], emergency["location"])
+        if distance is None or not self.assign_resource(resource["id"], emergency["id"], emergency):
+            # Unreachable or taken by another dispatcher - keep waiting
+            self.enqueue_demand(emergency, resource["type"])
+            return None
+        
+        match = {
+            "emergency_id": emergency["id"],
+            "resource": resource,
+            "distance": distance,
+            "path": path,
+            "eta": distance * 2
+        }
+        self._assignment_changed(emergency, added=resource["id"])
+        self.recent_matches.append(match)
+        return match
+    
+    def _assignment_changed(self, emergency, added=None, removed=None):
+        """Update an emergency's assigned units through on_assignment if set"""
+        assigned = [rid for rid in emergency.get("assigned_resources") or [] if rid != removed]
+        if added is not None and added not in assigned:
+            assigned.append(added)
+        
+        if self.on_assignment is None or not self.on_assignment(emergency["id"], assigned):
+            # No owner (or no longer active there): keep the local copy current
+            emergency["assigned_resources"] = assigned
+    
+    def preempt_resource(self, emergency, resource_type, max_distance=PREEMPTION_MAX_DISTANCE):
+        """
+        Reassign the nearest unit deployed on a less urgent emergency.
+        Bounded Dijkstra from the incident over the deployed-unit index;
+        at equal distance the least urgent assignment is taken. The
+        displaced emergency's need is re-queued as waiting demand.
+        Returns: (resource, distance, path, displaced_emergency)
+        """
+        priority = emergency.get("priority", 5)
+        self._sync_priorities()
+        by_location = self.deployed_index.get(resource_type, {})
+        
+        for distance, node, parent in self.route_graph.settle_order(emergency["location"]):
+            if max_distance is not None and distance > max_distance:
+                break
+            
+            units = by_location.get(node)
+            if not units:
+                continue
+            
+            candidates = sorted(
+                ((p, rid) for rid, p in list(units.items()) if p > priority),
+                reverse=True
+            )
+            for _, resource_id in candidates:
+                resource = self.resources.get(resource_id)
+                version = resource["version"]
+                displaced = self.deployed_for.get(resource_id)
+                if displaced is None or resource["status"] != "deployed":
+                    continue
+                if displaced.get("priority", 5) <= priority:
+                    continue  # reprioritised since it was indexed
+                
+                if not self._compare_and_set(resource, version, "deployed", emergency["id"], emergency):
+                    continue  # changed under us; try the next candidate
+                
+                self._assignment_changed(displaced, removed=resource_id)
+                self.enqueue_demand(displaced, resource_type)
+                
+                return resource, distance, Graph.build_path(parent, node), displaced
+        
+        return None, None, None, None
+    
+    def update_position(self, resource_id, latitude, longitude):
+        """
+        Apply a GPS ping: snap to the nearest routable node and move the unit.
+        Pings that stay on the same node only record coordinates - O(1).
+        Returns: the snapped location, or None if the ping can't be placed
+        """
+        resource = self.resources.get(resource_id)
+        if not resource:
+            return None
+        
+        resource["coordinates"] = (latitude, longitude)
+        nearest = self.node_index.k_nearest(*project_to_km(latitude, longitude), 1)
+        if not nearest:
+            return None
+        
+        location = nearest[0][1]
+        if location != resource["location"]:
+            self.move_resource(resource_id, location)
+        return location
+    
+    def move_resource(self, resource_id, location):
+        """
+        Move a unit to a new location, updating only its own index entries
+        """
         resource = self.resources.get(resource_id)
         if not resource:
             return False
         
-        emergency_id = resource["assigned_to"]
+        lock = self._stripes[hash(resource_id) % len(self._stripes)]
+        with lock:
+            if resource["location"] == location:
+                return True
+            
+            self.route_graph.add_node(location)
+            with self._index_lock:
+                available = resource["status"] == "available"
+                preemptible = resource_id in self.deployed_for
+                if available:
+                    self._unindex_available(resource)
+                if preemptible:
+                    self._unindex_deployed(resource)
+                resource["location"] = location
+                if available:
+                    self._index_available(resource)
+                if preemptible:
+                    self._index_deployed(resource, self.deployed_for[resource_id].get("priority", 5))
+        self._repair_labels()
+        return True
+    
+    def get_assigned_resources(self, emergency_id):
+        """Get IDs of resources currently assigned to an emergency"""
+        with self._index_lock:
+            return list(self.assignments.get(emergency_id, ()))
+    
+    def dispatch_nearest(self, emergency_id, location, resource_type=None, max_retries=5, emergency=None):
+        """
+        Claim the nearest available resource without a global lock.
+        On a lost compare-and-set, retry against the next-best candidate.
+        Returns: (resource, distance, path)
+        """
+        excluded = set()
+        attempts = conflicts = 0
+        result = (None, None, None)
         
-        resource["status"] = "available"
-        resource["assigned_to"] = None
+        for _ in range(max_retries + 1):
+            resource, distance, path = self.find_nearest_resource(
+                location, resource_type, exclude=excluded
+            )
+            if resource is None:
+                break
+            
+            attempts += 1
+            if self.assign_resource(resource["id"], emergency_id, emergency):
+                result = (resource, distance, path)
+                break
+            
+            conflicts += 1
+            excluded.add(resource["id"])
         
-        # Remove from assignments
-        if emergency_id and emergency_id in self.assignments:
-            self.assignments[emergency_id] = [
-                r for r in self.assignments[emergency_id] if r != resource_id
-            ]
+        with self._index_lock:
+            self.dispatch_stats["attempts"] += attempts
+            self.dispatch_stats["conflicts"] += conflicts
+            if result[0] is not None:
+                self.dispatch_stats["assigned"] += 1
         
-        return True
+        return result
     
-    def find_nearest_resource(self, location, resource_type=None):
+    def find_nearest_resource(self, location, resource_type=None, exclude=None):
         """
-        Find nearest available resource to a location
+        Find nearest available resource to a location.
+        Without exclusions this is a Voronoi label read. Otherwise candidates
+        come from the spatial index in order of air distance; Dijkstra runs
+        only until air distance * ratio exceeds the best route found.
+        Falls back to a full scan when the bound is unusable, e.g. when
+        short edges join far-apart cities (weights not tracking geography).
         Returns: (resource, distance, path)
         """
-        available = self.get_available_resources(resource_type)
+        types = [resource_type] if resource_type else list(self.available_by_type)
+        origin = self._position(location)
+        exclude = exclude or ()
+        
+        if not exclude:
+            nearest = self._nearest_from_labels(location, types)
+            if nearest is not None:
+                return nearest
+        
+        if origin is None or not self._can_prune():
+            candidates = [
+                r for r in self.get_available_resources(resource_type)
+                if r["id"] not in exclude
+            ]
+            return self._scan_nearest(candidates, location)
+        
+        # Units without coordinates can never be pruned
+        unplaced = []
+        for t in types:
+            unplaced.extend(
+                r for r in list(self.unplaced_by_type.get(t, {}).values())
+                if r["id"] not in exclude
+            )
+        best = self._scan_nearest(unplaced, location)
+        best_resource, best_distance, best_path = best
+        if best_distance is None:
+            best_distance = float('inf')
+        
+        routes = {}  # resource location -> (distance, path)
+        streams = [
+            self.spatial_index[t].nearest(*origin)
+            for t in types if t in self.spatial_index
+        ]
         
-        if not available:
+        for air_distance, resource_id in heapq.merge(*streams):
+            if air_distance * self._air_ratio >= best_distance:
+                break
+            if resource_id in exclude:
+                continue
+            
+            resource = self.resources.get(resource_id)
+            resource_location = resource["location"]
+            if resource_location not in routes:
+                routes[resource_location] = self.route_graph.dijkstra(resource_location, location)
+            distance, path = routes[resource_location]
+            
+            if distance is not None and distance < best_distance:
+                best_resource = resource
+                best_distance = distance
+                best_path = path
+        
+        if best_resource is None:
+            return None, None, None
+        return best_resource, best_distance, best_path
+    
+    def find_k_nearest_resources(self, location, resource_type=None, k=3):
+        """
+        Top-k closest available units in one bounded Dijkstra from the
+        emergency location; the search stops once k units are settled.
+        Paths are built lazily: call candidate["get_path"]() when needed.
+        Returns: list of candidate dicts ordered by distance
+        """
+        candidates = []
+        if k <= 0:
+            return candidates
+        
+        for distance, node, parent in self.route_graph.settle_order(location):
+            for resource in self.get_available_at_location(node, resource_type):
+                candidates.append({
+                    "resource": resource,
+                    "distance": distance,
+                    "eta": distance * 2,  # Same simple ETA as auto-assign
+                    "get_path": lambda node=node, parent=parent: Graph.build_path(parent, node)
+                })
+                if len(candidates) >= k:
+                    return candidates
+        
+        return candidates
+    
+    def _nearest_from_labels(self, location, types):
+        """
+        O(1) nearest-unit read from the Voronoi labels
+        Returns: (resource, distance, path), or None if labels can't answer
+        """
+        if location not in self.route_graph.nodes:
+            return None
+        
+        # Lock-free read: labels may be mid-repair or trail the indexes by
+        # queued updates, so anything missing or stale defers to the search
+        best = None
+        for t in types:
+            voronoi = self.voronoi.get(t)
+            label = voronoi.lookup(location) if voronoi else None
+            if label is not None and (best is None or label[0] < best[0]):
+                best = (label[0], label[1], voronoi)
+        
+        if best is None:
+            return None
+        
+        distance, resource_id, voronoi = best
+        resource = self.resources.get(resource_id)
+        path = voronoi.path(location)
+        if resource is None or path is None or path[0] != resource["location"]:
+            return None
+        
+        # Equally near units share a depot: rotate to the least recently used
+        resource = self._rotation_pick(resource)
+        if resource["status"] != "available":
+            return None
+        return resource, distance, path
+    
+    def _scan_nearest(self, candidates, location):
+        """Exact nearest resource by running Dijkstra for every candidate"""
+        if not candidates:
             return None, None, None
         
         best_resource = None
         best_distance = float('inf')
         best_path = None
         
-        for resource in available:
+        for resource in candidates:
             resource_location = resource["location"]
             
             distance, path = self.route_graph.dijkstra(resource_location, location)
@@ -146,6 +841,8 @@ class ResourceManager:
                 best_distance = distance
                 best_path = path
         
+        if best_resource is None:
+            return None, None, None
         return best_resource, best_distance, best_path
     
     def auto_assign_resources(self, emergency):
@@ -161,20 +858,208 @@ class ResourceManager:
         
         assigned = []
         
+        # Enough units per type to cover affected_people
+        plan, parent = self.plan_allocation(emergency, needed_types)
+        
         for resource_type in needed_types:
-            resource, distance, path = self.find_nearest_resource(location, resource_type)
-            
-            if resource:
-                if self.assign_resource(resource["id"], emergency["id"]):
+            count = 0
+            for distance, resource, node in plan.get(resource_type, []):
+                if self.assign_resource(resource["id"], emergency["id"], emergency):
+                    count += 1
                     assigned.append({
                         "resource": resource,
                         "distance": distance,
-                        "path": path,
+                        "path": Graph.build_path(parent, node),
                         "eta": distance * 2 if distance else None  # Simple ETA calculation
                     })
+            if count:
+                continue
+            
+            # Planned units lost to other dispatchers, or none reachable
+            resource, distance, path = self.dispatch_nearest(
+                emergency["id"], location, resource_type, emergency=emergency
+            )
+            
+            # Critical incidents may pull a unit off a lower-priority job
+            if not resource and emergency.get("priority", 5) <= PREEMPTION_PRIORITY:
+                resource, distance, path, _ = self.preempt_resource(emergency, resource_type)
+            
+            if resource:
+                assigned.append({
+                    "resource": resource,
+                    "distance": distance,
+                    "path": path,
+                    "eta": distance * 2 if distance else None  # Simple ETA calculation
+                })
+            else:
+                self.enqueue_demand(emergency, resource_type)
         
         return assigned
     
+    def plan_allocation(self, emergency, resource_types=None, max_units=ALLOCATION_MAX_UNITS):
+        """
+        Choose enough nearby units of each type to cover affected_people.
+        One lazy Dijkstra from the incident collects candidates until the
+        nearest-first cover of every type is complete; a greedy cover then
+        picks the cheapest combination by travel distance. Equally good
+        units at one depot are taken in rotation (least recently used).
+        Returns: ({type: [(distance, resource, node)]}, parent map)
+        """
+        demand = max(1, int(emergency.get("affected_people") or 1))
+        types = resource_types or self._get_needed_resources(emergency["type"])
+        
+        pools = {t: [] for t in types}
+        covered = {t: 0 for t in types}
+        radius = {}  # type -> distance at which nearest-first covers demand
+        open_types = set(types)
+        parent = {}
+        
+        for distance, node, parent in self.route_graph.settle_order(emergency["location"]):
+            for t in list(open_types):
+                if t in radius and distance > radius[t]:
+                    open_types.discard(t)
+                    continue
+                
+                # Rotation order: ties in the cover go to the least recently used unit
+                for resource in self._rotation_order(node, t):
+                    pools[t].append((distance, resource, node))
+                    covered[t] += resource["capacity"]
+                    if t not in radius and (covered[t] >= demand or len(pools[t]) >= max_units):
+                        radius[t] = distance
+            
+            if not open_types:
+                break
+        
+        plan = {t: self._greedy_cover(pools[t], demand, max_units) for t in types}
+        return plan, parent
+    
+    def _greedy_cover(self, pool, demand, max_units):
+        """
+        Min-distance cover of demand by unit capacities (min-knapsack).
+        Greedy by distance per useful seat, distance / min(capacity,
+        remaining); before each step, "chosen so far + the nearest single
+        unit covering the rest" is kept as a candidate. The cheapest of
+        those and the pure greedy is the classic 2-approximation.
+        Ties go to the earlier pool entry (rotation order).
+        """
+        chosen = []
+        taken = set()
+        cost = 0
+        remaining = demand
+        best = None  # (cost, units) of the cheapest full cover so far
+        
+        while remaining > 0 and len(chosen) < max_units:
+            finisher = min(
+                (
+                    (d, j) for j, (d, r, _) in enumerate(pool)
+                    if j not in taken and r["capacity"] >= remaining
+                ),
+                default=None
+            )
+            if finisher is not None and (best is None or cost + finisher[0] < best[0]):
+                best = (cost + finisher[0], chosen + [pool[finisher[1]]])
+            
+            step = min(
+                (
+                    (d / max(min(r["capacity"], remaining), 1), j)
+                    for j, (d, r, _) in enumerate(pool) if j not in taken
+                ),
+                default=None
+            )
+            if step is None:
+                break
+            
+            i = step[1]
+            taken.add(i)
+            chosen.append(pool[i])
+            cost += pool[i][0]
+            remaining -= pool[i][1]["capacity"]
+        
+        if remaining <= 0 and (best is None or cost < best[0]):
+            best = (cost, chosen)
+        
+        # No full cover within max_units: send what the greedy found
+        return best[1] if best is not None else chosen
+    
+    def batch_assign_resources(self, emergencies):
+        """
+        Assign resources to many emergencies in one pass.
+        Builds one cost matrix per resource type and solves a
+        priority-weighted min-cost assignment (Hungarian algorithm),
+        so a surge of low-priority incidents cannot starve priority 1.
+        Returns: dict emergency_id -> list of assignments
+        """
+        results = {emergency["id"]: [] for emergency in emergencies}
+        
+        # One Dijkstra tree per distinct emergency location
+        trees = {}
+        for emergency in emergencies:
+            location = emergency["location"]
+            if location not in trees:
+                trees[location] = self.route_graph.dijkstra_all(location)
+        
+        # Demand slots grouped by resource type
+        slots_by_type = {}
+        for emergency in emergencies:
+            for resource_type in self._get_needed_resources(emergency["type"]):
+                slots_by_type.setdefault(resource_type, []).append(emergency)
+        
+        for resource_type, slots in slots_by_type.items():
+            units = self.get_available_resources(resource_type)
+            if not units:
+                for emergency in slots:
+                    self.enqueue_demand(emergency, resource_type)
+                continue
+            
+            distances = [
+                [trees[e["location"]][0].get(r["location"]) for r in units]
+                for e in slots
+            ]
+            max_distance = max(
+                (d for row in distances for d in row if d is not None), default=0
+            )
+            
+            # Priority bonus outweighs any distance; unreachable pairs cost most
+            weight = max_distance + 1
+            unreachable = weight * 6 + max_distance
+            cost = []
+            for emergency, row in zip(slots, distances):
+                urgency = 6 - emergency.get("priority", 5)
+                cost.append([
+                    unreachable if d is None else d - weight * urgency
+                    for d in row
+                ])
+            
+            if len(slots) <= len(units):
+                pairs = list(enumerate(hungarian(cost)))
+            else:
+                transposed = [list(col) for col in zip(*cost)]
+                pairs = [(i, j) for j, i in enumerate(hungarian(transposed))]
+            
+            # Commit all assignments for this type; unserved slots wait
+            served = set()
+            for i, j in pairs:
+                emergency, resource = slots[i], units[j]
+                dist, parent = trees[emergency["location"]]
+                distance = dist.get(resource["location"])
+                if distance is None:
+                    continue
+                
+                if self.assign_resource(resource["id"], emergency["id"], emergency):
+                    served.add(i)
+                    results[emergency["id"]].append({
+                        "resource": resource,
+                        "distance": distance,
+                        "path": Graph.build_path(parent, resource["location"]),
+                        "eta": distance * 2
+                    })
+            
+            for i, emergency in enumerate(slots):
+                if i not in served:
+                    self.enqueue_demand(emergency, resource_type)
+        
+        return results
+    
     def _get_needed_resources(self, emergency_type):
         """Determine what resources are needed for emergency type"""
         resource_map = {
@@ -192,7 +1077,19 @@ class ResourceManager:
     
     def add_route(self, from_location, to_location, distance):
         """Add a route between two locations"""
+        old_weight = self.route_graph.adj.get(from_location, {}).get(to_location)
         self.route_graph.add_edge(from_location, to_location, distance)
+        self._note_edge(from_location, to_location, distance)
+        
+        weight = self.route_graph.get_weight(from_location, to_location)
+        self._label_ops.append(("route", (old_weight, weight), from_location, to_location))
+        self._repair_labels()
+        
+        self.changes.publish("route_added", ("route", from_location, to_location), {
+            "from": from_location,
+            "to": to_location,
+            "distance": weight
+        })
     
     def find_shortest_path(self, from_location, to_location):
         """Find shortest path between two locations"""
@@ -211,21 +1108,11 @@ class ResourceManager:
         return self.route_graph.get_stats()
     
     def get_resource_stats(self):
-        """Get resource statistics"""
-        all_resources = self.resources.values()
-        
-        stats = {
-            "total": len(all_resources),
-            "available": len([r for r in all_resources if r["status"] == "available"]),
-            "deployed": len([r for r in all_resources if r["status"] == "deployed"]),
-            "maintenance": len([r for r in all_resources if r["status"] == "maintenance"]),
-            "by_type": {}
-        }
-        
-        for resource_type, resources in self.resources_by_type.items():
-            stats["by_type"][resource_type] = {
-                "total": len(resources),
-                "available": len([r for r in resources if r["status"] == "available"])
-            }
-        
-        return stats
\ No newline at end of file
+        """Get resource statistics - O(1), read from maintained counters"""
+        return {
+            "total": self.resources.count,
+            "available": self.status_counts.get("available", 0),
+            "deployed": self.status_counts.get("deployed", 0),
+            "maintenance": self.status_counts.get("maintenance", 0),
+            "by_type": {t: dict(c) for t, c in self.type_counts.items()}
+        }
\ No newline at end of file
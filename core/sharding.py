@@ -0,0 +1,221 @@
+# core/sharding.py - Multi-process incident core partitioned by city
+
+import heapq
+import itertools
+import multiprocessing
+import os
+import random
+import zlib
+from config import SHARD_WORKERS
+from utils.helpers import split_location
+
+# Each shard generates IDs in its own block: EMG<(shard + 1) * ID_BLOCK + n>
+ID_BLOCK = 10_000_000
+
+def shard_for(location, num_shards):
+    """Stable shard index for a location's city (same in every process)"""
+    city, _ = split_location(location)
+    return zlib.crc32(city.lower().encode("utf-8")) % num_shards
+
+def _worker_main(conn, shard_id, num_shards, storage_dir, max_active, units_per_type, dedup):
+    """Shard process: owns one EmergencyManager/ResourceManager pair"""
+    # Imported here so spawned workers build their own module state
+    from core.emergency_manager import EmergencyManager
+    from core.resource_manager import ResourceManager
+    from core.change_feed import ChangeFeed
+    from config import RESOURCE_TYPES, MAJOR_CITIES
+    from utils.data_generator import data_generator
+    
+    # Keep generated IDs unique across shards
+    data_generator.emergency_counter = (shard_id + 1) * ID_BLOCK
+    
+    changes = ChangeFeed()  # shared, as in the app: reprioritisations reach dispatch
+    emergency_manager = EmergencyManager(
+        storage_dir=os.path.join(storage_dir, f"shard-{shard_id}") if storage_dir else None,
+        change_feed=changes
+    )
+    if max_active is not None:
+        emergency_manager.max_active = max_active
+    
+    # Units are stationed only in the cities this shard owns
+    resource_manager = ResourceManager(
+        change_feed=changes, on_assignment=emergency_manager.record_assignment
+    )
+    cities = [city for city in MAJOR_CITIES if shard_for(city, num_shards) == shard_id]
+    for resource_type in RESOURCE_TYPES:
+        for _ in range(units_per_type if cities else 0):
+            resource = data_generator.generate_resource(resource_type)
+            resource_manager.add_resource(resource_type, random.choice(cities), resource["capacity"])
+    
+    def dispatch_to(emergency):
+        if emergency and emergency.get("status") == "active" and not emergency.get("assigned_resources"):
+            assigned = resource_manager.auto_assign_resources(emergency)
+            emergency_manager.record_assignment(
+                emergency["id"], [a["resource"]["id"] for a in assigned]
+            )
+    
+    def report(emergencies, dispatch):
+        ids = emergency_manager.report_batch(emergencies, dedup)
+        if dispatch:
+            for emergency_id in ids:
+                dispatch_to(emergency_manager.get_emergency_by_id(emergency_id))
+        return [i if isinstance(i, str) else None for i in ids]
+    
+    def resolve(emergency_id):
+        emergency = emergency_manager.resolve_emergency(emergency_id)
+        if emergency:
+            resource_manager.release_all(emergency["id"])
+        
+        # Freed capacity may have re-admitted spooled incidents
+        for readmitted in emergency_manager.take_readmitted():
+            dispatch_to(readmitted)
+        return emergency.to_dict() if emergency else None
+    
+    def top(count):
+        return [e.to_dict() for e in emergency_manager.get_top_emergencies(count)]
+    
+    def totals():
+        stats = emergency_manager.get_statistics()
+        return {
+            "total_reported": stats["total_reported"],
+            "total_resolved": stats["total_resolved"],
+            "total_active": stats["total_active"],
+            "duplicates_merged": stats.get("duplicates_merged", 0),
+            "spooled": stats["spooled"],
+            "by_type": stats["by_type"],
+            "by_priority": stats["by_priority"],
+        }
+    
+    handlers = {
+        "report": report,
+        "resolve": resolve,
+        "top": top,
+        "totals": totals,
+        "by_location": lambda location: [
+            e.to_dict() for e in emergency_manager.get_emergencies_by_location(location)
+        ],
+    }
+    
+    while True:
+        op, args = conn.recv()
+        if op == "close":
+            emergency_manager.close()
+            conn.send(None)
+            break
+        try:
+            conn.send(("ok", handlers[op](*args)))
+        except Exception as exc:
+            conn.send(("error", repr(exc)))
+
+
+class ShardCoordinator:
+    """
+    Routes reports to worker processes partitioned by city (the part of
+    the location before " - "), one EmergencyManager and ResourceManager
+    per worker. Global queries scatter to every worker over its pipe and
+    gather/merge the partial answers.
+    """
+    
+    def __init__(self, num_workers=SHARD_WORKERS, storage_dir=None, max_active=None,
+                 units_per_type=0, dedup=True):
+        self.num_workers = num_workers
+        self.shard_of = {}  # caller-supplied emergency_id -> shard index (until resolved)
+        self.pipes = []
+        self.workers = []
+        
+        for shard_id in range(num_workers):
+            parent, child = multiprocessing.Pipe()
+            worker = multiprocessing.Process(
+                target=_worker_main,
+                args=(child, shard_id, num_workers, storage_dir, max_active, units_per_type, dedup),
+                daemon=True,
+            )
+            worker.start()
+            self.pipes.append(parent)
+            self.workers.append(worker)
+    
+    def _call(self, shard, op, *args):
+        self.pipes[shard].send((op, args))
+        return self._result(shard)
+    
+    def _result(self, shard):
+        status, value = self.pipes[shard].recv()
+        if status == "error":
+            raise RuntimeError(f"shard {shard}: {value}")
+        return value
+    
+    def _scatter(self, op, *args):
+        """Send op to every shard first, then gather - shards work in parallel"""
+        for pipe in self.pipes:
+            pipe.send((op, args))
+        return [self._result(shard) for shard in range(self.num_workers)]
+    
+    def report(self, emergency, dispatch=False):
+        """Report one emergency on its city's shard - returns its ID"""
+        return self.report_many([emergency], dispatch)[0]
+    
+    def report_many(self, emergencies, dispatch=False):
+        """
+        Report a batch: one message per shard, all shards in parallel.
+        Returns IDs in input order.
+        """
+        groups = {}
+        for index, emergency in enumerate(emergencies):
+            shard = shard_for(emergency["location"], self.num_workers)
+            groups.setdefault(shard, []).append(index)
+        
+        for shard, indexes in groups.items():
+            self.pipes[shard].send(("report", ([emergencies[i] for i in indexes], dispatch)))
+        
+        ids = [None] * len(emergencies)
+        for shard, indexes in groups.items():
+            for index, emergency_id in zip(indexes, self._result(shard)):
+                ids[index] = emergency_id
+                if emergency_id is not None and self._shard_from_id(emergency_id) != shard:
+                    self.shard_of[emergency_id] = shard
+        return ids
+    
+    def _shard_from_id(self, emergency_id):
+        """Shard encoded in a generated ID's number, or None"""
+        digits = "".join(ch for ch in str(emergency_id) if ch.isdigit())
+        shard = int(digits) // ID_BLOCK - 1 if digits else -1
+        return shard if 0 <= shard < self.num_workers else None
+    
+    def resolve(self, emergency_id):
+        shard = self.shard_of.pop(emergency_id, None)
+        if shard is None:
+            shard = self._shard_from_id(emergency_id)
+        if shard is None:
+            return None
+        return self._call(shard, "resolve", emergency_id)
+    
+    def get_emergencies_by_location(self, location):
+        return self._call(shard_for(location, self.num_workers), "by_location", location)
+    
+    def get_top_emergencies(self, count=5):
+        """Global top-N: merge each shard's top-N by urgency, then arrival"""
+        partials = self._scatter("top", count)
+        return heapq.nsmallest(
+            count, itertools.chain(*partials),
+            key=lambda e: (e.get("priority", 5), e.get("timestamp")),
+        )
+    
+    def get_totals(self):
+        """Global counters summed over shards"""
+        totals = {}
+        for partial in self._scatter("totals"):
+            for key, value in partial.items():
+                if isinstance(value, dict):
+                    bucket = totals.setdefault(key, {})
+                    for k, v in value.items():
+                        bucket[k] = bucket.get(k, 0) + v
+                else:
+                    totals[key] = totals.get(key, 0) + value
+        return totals
+    
+    def close(self):
+        for pipe in self.pipes:
+            pipe.send(("close", ()))
+        for pipe, worker in zip(self.pipes, self.workers):
+            pipe.recv()
+            worker.join()
@@ -0,0 +1,93 @@
+# core/spool.py - Disk-backed overflow queue for admission control
+
+import pickle
+import sqlite3
+import threading
+import time
+
+class OverflowSpool:
+    """
+    Disk-backed queue of emergencies waiting for admission.
+    Rows are ordered by (priority, arrival) so re-admission always takes
+    the most urgent, longest-waiting incident first. Only the queue head
+    is ever read back; waiting incidents stay out of RAM.
+    """
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS spool (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            id TEXT UNIQUE NOT NULL,
+            priority INTEGER NOT NULL,
+            spooled_at REAL NOT NULL,
+            data BLOB NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_spool_order ON spool(priority, seq);
+    """
+    
+    PUSH = "INSERT OR REPLACE INTO spool (id, priority, spooled_at, data) VALUES (?, ?, ?, ?)"
+    HEAD = "SELECT seq, priority, spooled_at, data FROM spool ORDER BY priority, seq LIMIT 1"
+    DELETE = "DELETE FROM spool WHERE seq = ?"
+    GET = "SELECT data FROM spool WHERE id = ?"
+    EXISTS = "SELECT 1 FROM spool WHERE id = ?"
+    DEPTH = "SELECT priority, COUNT(*), MIN(spooled_at) FROM spool GROUP BY priority"
+    
+    def __init__(self, path=":memory:"):
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+        self._size = self.conn.execute("SELECT COUNT(*) FROM spool").fetchone()[0]
+    
+    def push(self, emergency):
+        """Spool an emergency (committed before returning)"""
+        with self._lock, self.conn:
+            # Re-spooling an ID replaces its row (unique index lookup, no scan)
+            replaced = self.conn.execute(self.EXISTS, (emergency["id"],)).fetchone()
+            self.conn.execute(self.PUSH, (
+                emergency["id"],
+                emergency.get("priority", 5),
+                time.time(),
+                pickle.dumps(emergency, protocol=pickle.HIGHEST_PROTOCOL),
+            ))
+            if replaced is None:
+                self._size += 1
+    
+    def peek_priority(self):
+        """Priority of the next incident to re-admit, or None if empty"""
+        if not self._size:
+            return None
+        with self._lock:
+            row = self.conn.execute(self.HEAD).fetchone()
+        return row[1] if row else None
+    
+    def pop(self):
+        """
+        Remove the most urgent spooled emergency.
+        Returns: (emergency, seconds spooled) or (None, 0) if empty
+        """
+        with self._lock, self.conn:
+            row = self.conn.execute(self.HEAD).fetchone()
+            if row is None:
+                return None, 0
+            self.conn.execute(self.DELETE, (row[0],))
+            self._size -= 1
+        return pickle.loads(row[3]), time.time() - row[2]
+    
+    def get(self, emergency_id):
+        with self._lock:
+            row = self.conn.execute(self.GET, (emergency_id,)).fetchone()
+        return pickle.loads(row[0]) if row else None
+    
+    def depth_by_priority(self):
+        """priority -> (waiting count, seconds the oldest has waited)"""
+        now = time.time()
+        with self._lock:
+            rows = self.conn.execute(self.DEPTH).fetchall()
+        return {priority: (count, now - oldest) for priority, count, oldest in rows}
+    
+    def __len__(self):
+        return self._size
+    
+    def close(self):
+        with self._lock:
+            self.conn.close()
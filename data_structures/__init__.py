@@ -2,8 +2,16 @@
 
 from .heap import EmergencyHeap
 from .graph import Graph
-from .tree import BST
+from .tree import BST, AVLTree
 from .trie import Trie
 from .hash_table import HashTable
 from .linked_list import LinkedList # ADDED
-__all__ = ['EmergencyHeap', 'Graph', 'BST', 'Trie', 'HashTable', 'LinkedList']
\ No newline at end of file
+from .spatial_grid import SpatialGrid
+from .voronoi import GraphVoronoi
+from .circular_queue import CircularQueue
+from .sorted_index import SortedIndex
+from .multimap import MultiMap
+__all__ = [
+    'EmergencyHeap', 'Graph', 'BST', 'AVLTree', 'Trie', 'HashTable', 'LinkedList',
+    'SpatialGrid', 'GraphVoronoi', 'CircularQueue', 'SortedIndex', 'MultiMap'
+]
\ No newline at end of file
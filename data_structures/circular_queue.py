@@ -3,14 +3,16 @@
 class CircularQueue:
     """
     Circular Queue for round-robin resource assignment
+    A growable queue doubles its capacity instead of rejecting items.
     """
     
-    def __init__(self, capacity=100):
+    def __init__(self, capacity=100, growable=False):
         self.capacity = capacity
         self.queue = [None] * capacity
         self.front = 0
         self.rear = 0
         self.size = 0
+        self.growable = growable
     
     def is_empty(self):
         """Check if queue is empty"""
@@ -23,7 +25,9 @@ class CircularQueue:
     def enqueue(self, item):
         """Add item to queue"""
         if self.is_full():
-            return False
+            if not self.growable:
+                return False
+            self._grow()
         
         self.queue[self.rear] = item
         self.rear = (self.rear + 1) % self.capacity
@@ -59,6 +63,14 @@ class CircularQueue:
             index = (index + 1) % self.capacity
         return result
     
+    def _grow(self):
+        """Double capacity, unrolling items so front is at index 0"""
+        items = self.get_all()
+        self.capacity = max(1, self.capacity * 2)
+        self.queue = items + [None] * (self.capacity - len(items))
+        self.front = 0
+        self.rear = len(items) % self.capacity
+    
     def rotate(self):
         """Rotate queue - move front to back"""
         if not self.is_empty():
@@ -96,6 +96,79 @@ class Graph:
         
         return dist[end], path
     
+    def dijkstra_all(self, start):
+        """
+        Single-source Dijkstra to every reachable node
+        Returns: (dist, parent) dicts for reachable nodes only
+        """
+        if start not in self.nodes:
+            return {}, {}
+        
+        dist = {start: 0}
+        parent = {start: None}
+        visited = set()
+        pq = [(0, start)]
+        
+        while pq:
+            d, u = heapq.heappop(pq)
+            
+            if u in visited:
+                continue
+            
+            visited.add(u)
+            
+            for v, weight in self.adj[u].items():
+                new_dist = d + weight
+                if new_dist < dist.get(v, float('inf')):
+                    dist[v] = new_dist
+                    parent[v] = u
+                    heapq.heappush(pq, (new_dist, v))
+        
+        return dist, parent
+    
+    def settle_order(self, start):
+        """
+        Lazy Dijkstra: yields (distance, node, parent) as nodes are settled.
+        The consumer stops the search by no longer iterating; parent is the
+        shared parent map, so paths can be built later with build_path.
+        """
+        if start not in self.nodes:
+            return
+        
+        dist = {start: 0}
+        parent = {start: None}
+        visited = set()
+        pq = [(0, start)]
+        
+        while pq:
+            d, u = heapq.heappop(pq)
+            
+            if u in visited:
+                continue
+            
+            visited.add(u)
+            yield d, u, parent
+            
+            for v, weight in self.adj[u].items():
+                new_dist = d + weight
+                if new_dist < dist.get(v, float('inf')):
+                    dist[v] = new_dist
+                    parent[v] = u
+                    heapq.heappush(pq, (new_dist, v))
+    
+    @staticmethod
+    def build_path(parent, node):
+        """Walk a parent map back from node to the search source"""
+        if node not in parent:
+            return None
+        
+        path = []
+        current = node
+        while current is not None:
+            path.append(current)
+            current = parent[current]
+        return path
+    
     def bfs(self, start):
         """
         Breadth-First Search traversal
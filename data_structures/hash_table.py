@@ -10,6 +10,27 @@ class HashTable:
         self.size = size
         self.table = [[] for _ in range(size)]
         self.count = 0
+        self._reset_chain_stats()
+    
+    def _reset_chain_stats(self):
+        """Chain-length counters maintained on insert/delete for O(1) stats"""
+        self.non_empty = 0
+        self.chain_counts = {}  # chain length -> number of buckets
+        self.max_chain = 0
+    
+    def _chain_changed(self, old_length, new_length):
+        if old_length:
+            self.chain_counts[old_length] -= 1
+            if not self.chain_counts[old_length]:
+                del self.chain_counts[old_length]
+        if new_length:
+            self.chain_counts[new_length] = self.chain_counts.get(new_length, 0) + 1
+        
+        self.non_empty += (new_length > 0) - (old_length > 0)
+        if new_length > self.max_chain:
+            self.max_chain = new_length
+        while self.max_chain and self.max_chain not in self.chain_counts:
+            self.max_chain -= 1
     
     def _hash(self, key):
         """Hash function using polynomial rolling"""
@@ -32,6 +53,7 @@ class HashTable:
         # Insert new
         bucket.append((key, value))
         self.count += 1
+        self._chain_changed(len(bucket) - 1, len(bucket))
         
         # Rehash if load factor > 0.7
         if self.count / self.size > 0.7:
@@ -64,6 +86,7 @@ class HashTable:
             if k == key:
                 del bucket[i]
                 self.count -= 1
+                self._chain_changed(len(bucket) + 1, len(bucket))
                 return v
         
         return None
@@ -102,27 +125,27 @@ class HashTable:
         self.size *= 2
         self.table = [[] for _ in range(self.size)]
         self.count = 0
+        self._reset_chain_stats()
         
         for bucket in old_table:
             for key, value in bucket:
                 self.insert(key, value)
     
     def get_stats(self):
-        """Get hash table statistics"""
-        non_empty = sum(1 for bucket in self.table if bucket)
-        max_chain = max(len(bucket) for bucket in self.table)
-        avg_chain = self.count / non_empty if non_empty > 0 else 0
+        """Get hash table statistics - O(1), from maintained counters"""
+        avg_chain = self.count / self.non_empty if self.non_empty > 0 else 0
         
         return {
             "size": self.size,
             "count": self.count,
             "load_factor": self.count / self.size,
-            "non_empty_buckets": non_empty,
-            "max_chain_length": max_chain,
+            "non_empty_buckets": self.non_empty,
+            "max_chain_length": self.max_chain,
             "avg_chain_length": avg_chain
         }
     
     def clear(self):
         """Clear all entries"""
         self.table = [[] for _ in range(self.size)]
-        self.count = 0
\ No newline at end of file
+        self.count = 0
+        self._reset_chain_stats()
\ No newline at end of file
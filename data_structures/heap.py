@@ -1,7 +1,6 @@
 # data_structures/heap.py - Min Heap for Priority Queue
 
 import heapq
-from datetime import datetime
 
 class EmergencyHeap:
     """
@@ -13,22 +12,27 @@ class EmergencyHeap:
         self.heap = []
         self.counter = 0  # For tie-breaking (FIFO for same priority)
         self._id_map = {}  # Quick lookup by emergency ID
+        self.priority_counts = {}  # Maintained on push/pop/remove for O(1) stats
+    
+    def _count(self, priority, delta):
+        count = self.priority_counts.get(priority, 0) + delta
+        if count:
+            self.priority_counts[priority] = count
+        else:
+            self.priority_counts.pop(priority, None)
     
     def push(self, emergency):
         """Add emergency to priority queue"""
         priority = emergency.get("priority", 5)
         self.counter += 1
         
-        # Heap entry: (priority, counter, timestamp, emergency_dict)
-        entry = (
-            priority,
-            self.counter,
-            emergency.get("timestamp", datetime.now()),
-            emergency
-        )
+        # Heap entry: (priority, counter, emergency) - the counter is
+        # unique, so emergencies themselves are never compared
+        entry = (priority, self.counter, emergency)
         
         heapq.heappush(self.heap, entry)
         self._id_map[emergency["id"]] = entry
+        self._count(priority, 1)
         
     def pop(self):
         """Remove and return highest priority emergency"""
@@ -36,7 +40,8 @@ class EmergencyHeap:
             return None
         
         entry = heapq.heappop(self.heap)
-        emergency = entry[3]
+        emergency = entry[2]
+        self._count(entry[0], -1)
         
         if emergency["id"] in self._id_map:
             del self._id_map[emergency["id"]]
@@ -47,7 +52,7 @@ class EmergencyHeap:
         """View highest priority without removing"""
         if not self.heap:
             return None
-        return self.heap[0][3]
+        return self.heap[0][2]
     
     def remove_by_id(self, emergency_id):
         """Remove specific emergency by ID"""
@@ -56,13 +61,14 @@ class EmergencyHeap:
         
         # Mark as invalid and rebuild heap
         entry = self._id_map[emergency_id]
-        emergency = entry[3]
+        emergency = entry[2]
         
         # Remove from heap (rebuild approach)
-        self.heap = [e for e in self.heap if e[3]["id"] != emergency_id]
+        self.heap = [e for e in self.heap if e[2]["id"] != emergency_id]
         heapq.heapify(self.heap)
         
         del self._id_map[emergency_id]
+        self._count(entry[0], -1)
         return emergency
     
     def update_priority(self, emergency_id, new_priority):
@@ -76,11 +82,11 @@ class EmergencyHeap:
     
     def get_all(self):
         """Return all emergencies in priority order (non-destructive)"""
-        return [entry[3] for entry in sorted(self.heap)]
+        return [entry[2] for entry in sorted(self.heap)]
     
     def get_by_priority(self, priority):
         """Get all emergencies of specific priority"""
-        return [e[3] for e in self.heap if e[0] == priority]
+        return [e[2] for e in self.heap if e[0] == priority]
     
     def size(self):
         """Return number of emergencies in queue"""
@@ -94,17 +100,9 @@ class EmergencyHeap:
         """Clear all emergencies"""
         self.heap.clear()
         self._id_map.clear()
+        self.priority_counts.clear()
         self.counter = 0
     
     def get_stats(self):
-        """Get statistics about queue"""
-        if not self.heap:
-            return {"total": 0, "by_priority": {}}
-        
-        stats = {"total": len(self.heap), "by_priority": {}}
-        
-        for entry in self.heap:
-            priority = entry[0]
-            stats["by_priority"][priority] = stats["by_priority"].get(priority, 0) + 1
-        
-        return stats
\ No newline at end of file
+        """Get statistics about queue - O(1), from maintained counts"""
+        return {"total": len(self.heap), "by_priority": dict(self.priority_counts)}
\ No newline at end of file
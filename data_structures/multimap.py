@@ -0,0 +1,59 @@
+# data_structures/multimap.py - Hash multimap with O(1) pair removal
+
+from .hash_table import HashTable
+
+class MultiMap:
+    """
+    Multimap from key to many (item_id, value) pairs.
+    Each key maps to an insertion-ordered dict of its items, so adding
+    or removing one pair is O(1) and keys with no items left are
+    dropped, keeping the index no larger than its live contents.
+    """
+    
+    def __init__(self, size=100):
+        self.table = HashTable(size=size)
+        self.pairs = 0
+    
+    def add(self, key, item_id, value):
+        """Add or replace one pair"""
+        items = self.table.get(key)
+        if items is None:
+            items = {}
+            self.table.insert(key, items)
+        if item_id not in items:
+            self.pairs += 1
+        items[item_id] = value
+    
+    def remove(self, key, item_id):
+        """Remove one pair, returns its value or None"""
+        items = self.table.get(key)
+        if items is None or item_id not in items:
+            return None
+        
+        value = items.pop(item_id)
+        self.pairs -= 1
+        if not items:
+            self.table.delete(key)
+        return value
+    
+    def get(self, key):
+        """Values for key in insertion order"""
+        items = self.table.get(key)
+        return list(items.values()) if items else []
+    
+    def count(self, key):
+        items = self.table.get(key)
+        return len(items) if items else 0
+    
+    def contains(self, key, item_id):
+        items = self.table.get(key)
+        return items is not None and item_id in items
+    
+    def keys(self):
+        return self.table.keys()
+    
+    def get_stats(self):
+        return {**self.table.get_stats(), "pairs": self.pairs}
+    
+    def __len__(self):
+        return self.pairs
@@ -0,0 +1,50 @@
+# data_structures/sorted_index.py - Sorted array index for range queries
+
+from bisect import bisect_left, bisect_right
+
+class SortedIndex:
+    """
+    Sorted array of (key, value) pairs kept ordered with bisect.
+    Range queries cost O(log n + results); equal keys keep insertion order.
+    """
+    
+    def __init__(self):
+        self.keys = []
+        self.values = []
+    
+    def insert(self, key, value):
+        """Insert keeping keys sorted (appends when keys arrive in order)"""
+        if not self.keys or key >= self.keys[-1]:
+            self.keys.append(key)
+            self.values.append(value)
+            return
+        
+        index = bisect_right(self.keys, key)
+        self.keys.insert(index, key)
+        self.values.insert(index, value)
+    
+    def remove(self, key, value):
+        """Remove one (key, value) pair, returns True if found"""
+        index = bisect_left(self.keys, key)
+        while index < len(self.keys) and self.keys[index] == key:
+            if self.values[index] is value:
+                del self.keys[index]
+                del self.values[index]
+                return True
+            index += 1
+        return False
+    
+    def range(self, start=None, end=None):
+        """Values with start <= key < end (either bound optional)"""
+        lo = 0 if start is None else bisect_left(self.keys, start)
+        hi = len(self.keys) if end is None else bisect_left(self.keys, end)
+        return self.values[lo:hi]
+    
+    def count_range(self, start=None, end=None):
+        """Number of values with start <= key < end - O(log n)"""
+        lo = 0 if start is None else bisect_left(self.keys, start)
+        hi = len(self.keys) if end is None else bisect_left(self.keys, end)
+        return max(0, hi - lo)
+    
+    def __len__(self):
+        return len(self.keys)
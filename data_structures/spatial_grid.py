@@ -0,0 +1,119 @@
+# data_structures/spatial_grid.py - Uniform Grid for nearest-point search
+
+import heapq
+import math
+
+class SpatialGrid:
+    """
+    Uniform grid spatial index over planar (x, y) points.
+    Insert/remove/move are O(1); nearest() expands rings of cells
+    outward and yields points in increasing straight-line distance.
+    """
+    
+    def __init__(self, cell_size=25.0):
+        self.cell_size = cell_size
+        self.cells = {}  # (cx, cy) -> {key: (x, y)}
+        self.points = {}  # key -> (x, y)
+    
+    def _cell(self, x, y):
+        return (math.floor(x / self.cell_size), math.floor(y / self.cell_size))
+    
+    def insert(self, key, x, y):
+        """Add or move a point"""
+        if key in self.points:
+            self.remove(key)
+        
+        self.points[key] = (x, y)
+        self.cells.setdefault(self._cell(x, y), {})[key] = (x, y)
+    
+    def remove(self, key):
+        """Remove a point, returns True if it existed"""
+        point = self.points.pop(key, None)
+        if point is None:
+            return False
+        
+        cell = self._cell(*point)
+        bucket = self.cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self.cells[cell]
+        return True
+    
+    def move(self, key, x, y):
+        """Move an existing point (no-op if the cell is unchanged)"""
+        old = self.points.get(key)
+        if old is not None and self._cell(*old) == self._cell(x, y):
+            self.points[key] = (x, y)
+            self.cells[self._cell(x, y)][key] = (x, y)
+            return
+        self.insert(key, x, y)
+    
+    def contains(self, key):
+        return key in self.points
+    
+    def nearest(self, x, y):
+        """
+        Generator of (distance, key) in increasing distance from (x, y).
+        Only cells in rings that can still hold a closer point are visited.
+        """
+        if not self.points:
+            return
+        
+        cx, cy = self._cell(x, y)
+        
+        # Snapshots keep iteration safe while other threads update the grid
+        cells = list(self.cells.items())
+        if not cells:
+            return
+        
+        # Largest ring that can contain an occupied cell
+        max_ring = max(
+            max(abs(ox - cx), abs(oy - cy)) for (ox, oy), _ in cells
+        )
+        
+        pq = []
+        for ring in range(max_ring + 1):
+            # Sparse grid: cheaper to sweep the occupied cells directly
+            if 8 * ring > len(cells):
+                for (ox, oy), bucket in cells:
+                    if max(abs(ox - cx), abs(oy - cy)) >= ring:
+                        for key, (px, py) in list(bucket.items()):
+                            heapq.heappush(pq, (math.hypot(px - x, py - y), key))
+                break
+            
+            for cell in self._ring_cells(cx, cy, ring):
+                for key, (px, py) in list(self.cells.get(cell, {}).items()):
+                    heapq.heappush(pq, (math.hypot(px - x, py - y), key))
+            
+            # Anything outside this ring is at least ring * cell_size away
+            bound = ring * self.cell_size
+            while pq and pq[0][0] <= bound:
+                yield heapq.heappop(pq)
+        
+        while pq:
+            yield heapq.heappop(pq)
+    
+    def k_nearest(self, x, y, k):
+        """Return up to k (distance, key) pairs nearest to (x, y)"""
+        result = []
+        for item in self.nearest(x, y):
+            result.append(item)
+            if len(result) >= k:
+                break
+        return result
+    
+    def _ring_cells(self, cx, cy, ring):
+        """Cells at Chebyshev distance exactly ring from (cx, cy)"""
+        if ring == 0:
+            yield (cx, cy)
+            return
+        
+        for dx in range(-ring, ring + 1):
+            yield (cx + dx, cy - ring)
+            yield (cx + dx, cy + ring)
+        for dy in range(-ring + 1, ring):
+            yield (cx - ring, cy + dy)
+            yield (cx + ring, cy + dy)
+    
+    def __len__(self):
+        return len(self.points)
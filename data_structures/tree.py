@@ -17,20 +17,24 @@ class BST:
     def __init__(self):
         self.root = None
         self.size_count = 0
+        self.height_count = 0  # Deepest insert so far (no deletes)
+        self.key_counts = {}  # Maintained on insert for O(1) stats
     
     def insert(self, key, value):
         """Insert a key-value pair"""
-        self.root = self._insert(self.root, key, value)
+        self.root = self._insert(self.root, key, value, 1)
         self.size_count += 1
+        self.key_counts[key] = self.key_counts.get(key, 0) + 1
     
-    def _insert(self, node, key, value):
+    def _insert(self, node, key, value, depth):
         if node is None:
+            self.height_count = max(self.height_count, depth)
             return TreeNode(key, value)
         
         if key < node.key:
-            node.left = self._insert(node.left, key, value)
+            node.left = self._insert(node.left, key, value, depth + 1)
         else:
-            node.right = self._insert(node.right, key, value)
+            node.right = self._insert(node.right, key, value, depth + 1)
         
         return node
     
@@ -91,8 +95,8 @@ class BST:
             result.append(node.value)
     
     def get_height(self):
-        """Get height of tree"""
-        return self._get_height(self.root)
+        """Get height of tree - O(1), tracked on insert"""
+        return self.height_count
     
     def _get_height(self, node):
         if node is None:
@@ -112,12 +116,8 @@ class BST:
             self._get_keys(node.right, keys)
     
     def count_by_key(self):
-        """Count occurrences of each key"""
-        counts = {}
-        for item in self.inorder():
-            key = item.get("type", "Unknown")
-            counts[key] = counts.get(key, 0) + 1
-        return counts
+        """Count occurrences of each key - O(keys), tracked on insert"""
+        return dict(self.key_counts)
     
     def size(self):
         """Get total number of nodes"""
@@ -125,4 +125,157 @@ class BST:
     
     def is_empty(self):
         """Check if tree is empty"""
-        return self.root is None
\ No newline at end of file
+        return self.root is None
+
+class AVLTree:
+    """
+    Self-balancing (AVL) tree for storing resolved emergencies
+    Key: emergency type, Value: bucket of every emergency with that key.
+    Height stays O(log keys) however many duplicates are inserted.
+    """
+    
+    def __init__(self):
+        self.root = None
+        self.size_count = 0
+        self.key_counts = {}
+    
+    def _height(self, node):
+        return node.height if node else 0
+    
+    def _update(self, node):
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+    
+    def _balance(self, node):
+        return self._height(node.left) - self._height(node.right)
+    
+    def _rotate_right(self, node):
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+    
+    def _rotate_left(self, node):
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+    
+    def _rebalance(self, node):
+        self._update(node)
+        balance = self._balance(node)
+        
+        if balance > 1:
+            if self._balance(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        
+        if balance < -1:
+            if self._balance(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        
+        return node
+    
+    def insert(self, key, value):
+        """Insert a key-value pair - O(log keys)"""
+        self.root = self._insert(self.root, key, value)
+        self.size_count += 1
+        self.key_counts[key] = self.key_counts.get(key, 0) + 1
+    
+    def _insert(self, node, key, value):
+        if node is None:
+            return TreeNode(key, [value])
+        
+        if key < node.key:
+            node.left = self._insert(node.left, key, value)
+        elif key > node.key:
+            node.right = self._insert(node.right, key, value)
+        else:
+            node.value.append(value)  # Same key: extend the bucket
+            return node
+        
+        return self._rebalance(node)
+    
+    def _find(self, key):
+        node = self.root
+        while node:
+            if key < node.key:
+                node = node.left
+            elif key > node.key:
+                node = node.right
+            else:
+                return node
+        return None
+    
+    def search(self, key):
+        """Search for all values with given key - O(log keys + results)"""
+        node = self._find(key)
+        return list(node.value) if node else []
+    
+    def inorder(self):
+        """Inorder traversal (sorted by key)"""
+        result = []
+        self._inorder(self.root, result)
+        return result
+    
+    def _inorder(self, node, result):
+        if node:
+            self._inorder(node.left, result)
+            result.extend(node.value)
+            self._inorder(node.right, result)
+    
+    def preorder(self):
+        """Preorder traversal"""
+        result = []
+        self._preorder(self.root, result)
+        return result
+    
+    def _preorder(self, node, result):
+        if node:
+            result.extend(node.value)
+            self._preorder(node.left, result)
+            self._preorder(node.right, result)
+    
+    def postorder(self):
+        """Postorder traversal"""
+        result = []
+        self._postorder(self.root, result)
+        return result
+    
+    def _postorder(self, node, result):
+        if node:
+            self._postorder(node.left, result)
+            self._postorder(node.right, result)
+            result.extend(node.value)
+    
+    def get_height(self):
+        """Get height of tree - O(1), stored on the root"""
+        return self._height(self.root)
+    
+    def get_all_keys(self):
+        """Get all unique keys in sorted order"""
+        keys = []
+        self._get_keys(self.root, keys)
+        return keys
+    
+    def _get_keys(self, node, keys):
+        if node:
+            self._get_keys(node.left, keys)
+            keys.append(node.key)
+            self._get_keys(node.right, keys)
+    
+    def count_by_key(self):
+        """Count occurrences of each key - O(keys)"""
+        return dict(self.key_counts)
+    
+    def size(self):
+        """Get total number of stored values"""
+        return self.size_count
+    
+    def is_empty(self):
+        """Check if tree is empty"""
+        return self.root is None
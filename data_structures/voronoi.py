@@ -0,0 +1,145 @@
+# data_structures/voronoi.py - Graph Voronoi labels (nearest source per node)
+
+import heapq
+
+class GraphVoronoi:
+    """
+    Graph Voronoi partition built by multi-source Dijkstra.
+    Every reachable node is labelled with its nearest source, the
+    distance to it and the next hop towards it. Adding a source or an
+    edge only relaxes improved nodes; removing a source only repairs
+    the region it owned.
+    """
+    
+    def __init__(self, graph):
+        self.graph = graph
+        self.labels = {}  # node -> (distance, source_id, parent)
+        self.regions = {}  # source_id -> {nodes labelled with it}
+        self.sources = {}  # source_id -> node
+        self.sources_at = {}  # node -> {source_id: True}
+    
+    def _set_label(self, node, distance, source_id, parent):
+        old = self.labels.get(node)
+        if old is not None:
+            region = self.regions.get(old[1])
+            if region is not None:
+                region.discard(node)
+                if not region:
+                    del self.regions[old[1]]
+        
+        self.labels[node] = (distance, source_id, parent)
+        self.regions.setdefault(source_id, set()).add(node)
+    
+    def _propagate(self, pq):
+        """Decrease-only Dijkstra from already-labelled seeds in pq"""
+        while pq:
+            d, node = heapq.heappop(pq)
+            label = self.labels.get(node)
+            if label is None or d > label[0]:
+                continue
+            
+            source_id = label[1]
+            for neighbor, weight in self.graph.adj.get(node, {}).items():
+                new_dist = d + weight
+                current = self.labels.get(neighbor)
+                if current is None or new_dist < current[0]:
+                    self._set_label(neighbor, new_dist, source_id, node)
+                    heapq.heappush(pq, (new_dist, neighbor))
+    
+    def add_source(self, source_id, node):
+        """Add a source at node, relabelling only nodes that get closer"""
+        self.sources[source_id] = node
+        self.sources_at.setdefault(node, {})[source_id] = True
+        
+        label = self.labels.get(node)
+        if label is None or label[0] > 0:
+            self._set_label(node, 0, source_id, None)
+            self._propagate([(0, node)])
+    
+    def remove_source(self, source_id):
+        """Remove a source and repair only the region it owned"""
+        node = self.sources.pop(source_id, None)
+        if node is None:
+            return
+        
+        at_node = self.sources_at.get(node)
+        if at_node is not None:
+            at_node.pop(source_id, None)
+            if not at_node:
+                del self.sources_at[node]
+        
+        region = self.regions.pop(source_id, set())
+        for n in region:
+            del self.labels[n]
+        
+        pq = []
+        for n in region:
+            # Other sources inside the region
+            for other in self.sources_at.get(n, {}):
+                self._set_label(n, 0, other, None)
+                pq.append((0, n))
+                break
+            
+            # Best entry across the region boundary
+            for neighbor, weight in self.graph.adj.get(n, {}).items():
+                outside = self.labels.get(neighbor)
+                if outside is None:
+                    continue
+                candidate = outside[0] + weight
+                current = self.labels.get(n)
+                if current is None or candidate < current[0]:
+                    self._set_label(n, candidate, outside[1], neighbor)
+                    pq.append((candidate, n))
+        
+        heapq.heapify(pq)
+        self._propagate(pq)
+    
+    def relax_edge(self, u, v, weight):
+        """Update labels after an edge was added or shortened"""
+        pq = []
+        for a, b in ((u, v), (v, u)):
+            label = self.labels.get(a)
+            if label is None:
+                continue
+            current = self.labels.get(b)
+            if current is None or label[0] + weight < current[0]:
+                self._set_label(b, label[0] + weight, label[1], a)
+                pq.append((label[0] + weight, b))
+        
+        heapq.heapify(pq)
+        self._propagate(pq)
+    
+    def rebuild(self):
+        """Full multi-source Dijkstra from every source"""
+        self.labels.clear()
+        self.regions.clear()
+        
+        pq = []
+        for node, source_ids in self.sources_at.items():
+            for source_id in source_ids:
+                self._set_label(node, 0, source_id, None)
+                pq.append((0, node))
+                break
+        
+        heapq.heapify(pq)
+        self._propagate(pq)
+    
+    def lookup(self, node):
+        """Nearest source for node: (distance, source_id) or None - O(1)"""
+        label = self.labels.get(node)
+        if label is None:
+            return None
+        return label[0], label[1]
+    
+    def path(self, node):
+        """Path from the nearest source to node, or None if unavailable"""
+        path = []
+        current = node
+        while current is not None:
+            label = self.labels.get(current)
+            if label is None or len(path) > len(self.labels):
+                return None
+            path.append(current)
+            current = label[2]
+        path.reverse()
+        return path
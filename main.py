@@ -5,14 +5,14 @@ from datetime import datetime
 import random
 
 # Core imports
-from core import EmergencyManager, ResourceManager, AnalyticsEngine
+from core import EmergencyManager, ResourceManager, AnalyticsEngine, ChangeFeed
 
 # UI imports
 from ui import DashboardPage, ReportPage, AnalyticsPage, MapPage
 from ui.history_page import HistoryPage  # NEW
 
 # Config
-from config import APP_TITLE, WINDOW_SIZE, MIN_SIZE, COLORS, RESOURCE_TYPES
+from config import APP_TITLE, WINDOW_SIZE, MIN_SIZE, COLORS, RESOURCE_TYPES, DATA_DIR
 
 # Utils
 from utils.data_generator import data_generator
@@ -34,8 +34,11 @@ class CrisisFlowApp(ctk.CTk):
         ctk.set_default_color_theme("blue")
         
         # Core managers
-        self.emergency_manager = EmergencyManager()
-        self.resource_manager = ResourceManager()
+        self.changes = ChangeFeed()  # one version sequence for both managers
+        self.emergency_manager = EmergencyManager(storage_dir=DATA_DIR, change_feed=self.changes)
+        self.resource_manager = ResourceManager(
+            change_feed=self.changes, on_assignment=self.emergency_manager.record_assignment
+        )
         self.analytics = AnalyticsEngine(self.emergency_manager)
         
         # Initialize with sample data
@@ -183,21 +186,37 @@ class CrisisFlowApp(ctk.CTk):
                     resource["capacity"]
                 )
         
+        # Recovered from disk: re-claim the units recorded for open incidents
+        if self.emergency_manager.recovered:
+            for emergency in self.emergency_manager.get_active_emergencies():
+                for resource_id in emergency.get("assigned_resources", []):
+                    self.resource_manager.assign_resource(resource_id, emergency["id"], emergency)
+            
+            # Waiting demand is not persisted: dispatch incidents still without units
+            self.emergency_manager.take_readmitted()
+            self.dispatch_pending()
+            return
+        
         # Add active emergencies
         for _ in range(8):
             emergency = data_generator.generate_emergency()
-            self.report_emergency(emergency)
+            self.report_emergency(emergency, dedup=False)
         
         # Add resolved emergencies (for history/BST)
         for _ in range(50):
             emergency = data_generator.generate_emergency()
-            emergency_id = self.report_emergency(emergency)
+            emergency_id = self.report_emergency(emergency, dedup=False)
             # Immediately resolve it
             self.resolve_emergency(emergency_id)
     
     def _start_auto_refresh(self):
         """Start auto-refresh timer"""
-        self._update_quick_stats()
+        if not hasattr(self, "_stats_feed"):
+            self._stats_feed = self.changes.subscribe(0)
+        
+        # Only recompute when something changed since the last refresh
+        if self._stats_feed.poll() != []:
+            self._update_quick_stats()
         # Refresh every 3 seconds
         self.after(3000, self._start_auto_refresh)
     
@@ -259,20 +278,42 @@ class CrisisFlowApp(ctk.CTk):
         if hasattr(self.pages["map"], "refresh_data"):
             self.pages["map"].refresh_data()
     
-    def report_emergency(self, emergency_data):
-        """Report a new emergency"""
-        emergency_id = self.emergency_manager.report_emergency(emergency_data)
+    def report_emergency(self, emergency_data, dedup=True):
+        """Report a new emergency (duplicates merge into an active incident)"""
+        emergency_id = self.emergency_manager.report_emergency(emergency_data, dedup)
         return emergency_id
     
+    def dispatch_pending(self, emergencies=None):
+        """Batch-assign resources to active emergencies still waiting (default: all)"""
+        if emergencies is None:
+            emergencies = self.emergency_manager.get_active_emergencies()
+        pending = [
+            e for e in emergencies
+            if e.get("status") == "active" and not e.get("assigned_resources")
+        ]
+        results = self.resource_manager.batch_assign_resources(pending)
+        
+        for emergency in pending:
+            assigned = results.get(emergency["id"], [])
+            if assigned:
+                self.emergency_manager.record_assignment(
+                    emergency["id"], [a["resource"]["id"] for a in assigned]
+                )
+        
+        return results
+    
     def resolve_emergency(self, emergency_id=None):
         """Resolve an emergency - ENHANCED"""
         emergency = self.emergency_manager.resolve_emergency(emergency_id)
         
-        # Release assigned resources
-        if emergency and "assigned_resources" in emergency:
-            for resource_id in emergency.get("assigned_resources", []):
-                self.resource_manager.release_resource(resource_id)
-                print(f"✓ Resource {resource_id} released and marked as 'available'")
+        # Release assigned resources in one bulk operation
+        if emergency:
+            self.resource_manager.release_all(emergency["id"])
+        
+        # Freed capacity may have re-admitted spooled incidents
+        readmitted = self.emergency_manager.take_readmitted()
+        if readmitted:
+            self.dispatch_pending(readmitted)
         
         return emergency
 
@@ -280,7 +321,10 @@ class CrisisFlowApp(ctk.CTk):
 def main():
     """Main entry point"""
     app = CrisisFlowApp()
-    app.mainloop()
+    try:
+        app.mainloop()
+    finally:
+        app.emergency_manager.close()
 
 
 if __name__ == "__main__":
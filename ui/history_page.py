@@ -181,7 +181,7 @@ class HistoryPage(ctk.CTkScrollableFrame):
         tree_height = stats.get("tree_height", 0)
         resolved_by_type = stats.get("resolved_by_type", {})
         
-        stats_text = f"Tree Size: {tree_size} nodes | Height: {tree_height} | "
+        stats_text = f"Tree Size: {tree_size} records | Height: {tree_height} | "
         stats_text += f"Types: {len(resolved_by_type)}"
         
         self.bst_stats_label.configure(text=stats_text)
@@ -203,7 +203,7 @@ class HistoryPage(ctk.CTkScrollableFrame):
             ).pack(pady=20)
             return
         
-        # Search BST - O(log n) average
+        # Search AVL tree - O(log types + results)
         results = self.app.emergency_manager.get_resolved_by_type(search_type)
         
         if not results:
@@ -218,7 +218,7 @@ class HistoryPage(ctk.CTkScrollableFrame):
         # Show results
         result_header = ctk.CTkLabel(
             self.search_scroll,
-            text=f"Found {len(results)} result(s) - BST Search O(log n)",
+            text=f"Found {len(results)} result(s) - AVL Search O(log n)",
             font=("Segoe UI Semibold", 13),
             text_color="#10b981"
         )
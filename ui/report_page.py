@@ -266,7 +266,25 @@ class ReportPage(ctk.CTkScrollableFrame):
         # Step 3: Get emergency object
         emergency = self.app.emergency_manager.get_emergency_by_id(emergency_id)
         
-        if emergency:
+        if emergency and emergency.get("merged_reports"):
+            # Duplicate report: already dispatched with the original incident
+            self.details_text.insert("end", "STEP 3: Duplicate Detection (time-bucketed hash)\n")
+            self.details_text.insert("end", f"  ↺ Merged into active emergency {emergency_id}\n")
+            self.details_text.insert("end", f"  ↺ Reports: {emergency['merged_reports'] + 1} | Affected: {emergency.get('affected_people', 0)}\n")
+            self._show_status(
+                f"Duplicate report merged into {emergency_id}",
+                "warning"
+            )
+        elif emergency and emergency.get("status") == "spooled":
+            # Over the admission limit: queued, dispatched once readmitted
+            self.details_text.insert("end", "STEP 3: Admission Control (overflow spool)\n")
+            self.details_text.insert("end", f"  ⏸ Active set full - {emergency_id} queued by priority\n")
+            self.details_text.insert("end", f"  ⏸ Waiting in spool: {len(self.app.emergency_manager.spool)}\n")
+            self._show_status(
+                f"Emergency {emergency_id} queued - no resources dispatched yet",
+                "warning"
+            )
+        elif emergency:
             # Step 4: Auto-assign resources with Dijkstra - ENHANCED
             self.details_text.insert("end", "STEP 3: Resource Assignment (Dijkstra's Algorithm)\n")
             
@@ -293,7 +311,9 @@ class ReportPage(ctk.CTkScrollableFrame):
                     self.details_text.insert("end", f"     Complexity: O((V+E) log V) = O(({len(self.app.resource_manager.route_graph.nodes)}+{len(self.app.resource_manager.route_graph.edges)}) log {len(self.app.resource_manager.route_graph.nodes)})\n\n")
                 
                 # Store assignments in emergency
-                emergency["assigned_resources"] = [a["resource"]["id"] for a in assignments]
+                self.app.emergency_manager.record_assignment(
+                    emergency["id"], [a["resource"]["id"] for a in assignments]
+                )
                 
                 self._show_status(
                     f"✅ Emergency reported! Assigned: {', '.join(resource_names)}",
@@ -0,0 +1,71 @@
+# utils/assignment.py - Min-cost assignment (Hungarian algorithm)
+
+INF = float('inf')
+
+def hungarian(cost):
+    """
+    Solve the rectangular assignment problem with the Hungarian algorithm.
+    cost: n x m matrix (list of lists) with n <= m
+    Returns: list where result[i] is the column assigned to row i
+    Complexity: O(n^2 * m)
+    """
+    n = len(cost)
+    if n == 0:
+        return []
+    m = len(cost[0])
+    if n > m:
+        raise ValueError("hungarian() needs rows <= columns")
+    
+    # Potentials and matching (1-indexed, column 0 is a sentinel)
+    u = [0.0] * (n + 1)
+    v = [0.0] * (m + 1)
+    match = [0] * (m + 1)  # match[j] = row assigned to column j
+    way = [0] * (m + 1)
+    
+    for i in range(1, n + 1):
+        match[0] = i
+        j0 = 0
+        min_v = [INF] * (m + 1)
+        used = [False] * (m + 1)
+        
+        # Grow an alternating tree until a free column is reached
+        while True:
+            used[j0] = True
+            i0 = match[j0]
+            row = cost[i0 - 1]
+            delta = INF
+            j1 = 0
+            
+            for j in range(1, m + 1):
+                if used[j]:
+                    continue
+                reduced = row[j - 1] - u[i0] - v[j]
+                if reduced < min_v[j]:
+                    min_v[j] = reduced
+                    way[j] = j0
+                if min_v[j] < delta:
+                    delta = min_v[j]
+                    j1 = j
+            
+            for j in range(m + 1):
+                if used[j]:
+                    u[match[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_v[j] -= delta
+            
+            j0 = j1
+            if match[j0] == 0:
+                break
+        
+        # Flip the augmenting path
+        while j0:
+            j1 = way[j0]
+            match[j0] = match[j1]
+            j0 = j1
+    
+    result = [-1] * n
+    for j in range(1, m + 1):
+        if match[j]:
+            result[match[j] - 1] = j - 1
+    return result
@@ -2,7 +2,9 @@
 
 from datetime import datetime
 import json
+import math
 import os
+from config import CITY_COORDINATES, MUMBAI_AREA_COORDINATES
 
 def format_timestamp(timestamp):
     """Format timestamp for display"""
@@ -37,6 +39,33 @@ def calculate_eta(distance, avg_speed=40):
         return 0
     return (distance / avg_speed) * 60
 
+def split_location(location):
+    """Split 'City - Area' into (city, area); area is None for plain cities"""
+    if " - " in location:
+        city, area = location.split(" - ", 1)
+        return city.strip(), area.strip()
+    return location.strip(), None
+
+def get_coordinates(location):
+    """
+    Look up approximate (latitude, longitude) for a location string
+    Returns: tuple or None if the location is unknown
+    """
+    city, area = split_location(location)
+    if area and city == "Mumbai" and area in MUMBAI_AREA_COORDINATES:
+        return MUMBAI_AREA_COORDINATES[area]
+    # Unknown areas fall back to the city centre
+    return CITY_COORDINATES.get(city)
+
+def project_to_km(latitude, longitude, reference_latitude=20.0):
+    """
+    Equirectangular projection of (lat, lon) to planar (x, y) in km.
+    Straight-line distance between projected points is the 'air distance'.
+    """
+    x = longitude * 111.32 * math.cos(math.radians(reference_latitude))
+    y = latitude * 110.57
+    return x, y
+
 def get_priority_color(priority):
     """Get color for priority level"""
     colors = {